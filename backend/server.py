@@ -1,20 +1,29 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Response, Request, BackgroundTasks
-from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Response, Request, Query
+from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import CursorType, ReturnDocument
+from pymongo.collation import Collation
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Literal
+from typing import List, Optional, Literal, Union
 import uuid
-from datetime import datetime, timezone, timedelta
+import re
+import json
+import base64
+from datetime import date, datetime, timezone, timedelta
 import httpx
 import secrets
 import discord
 import asyncio
 import random
+import socket
+import time
+from collections import OrderedDict
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -56,10 +65,193 @@ RANK_TO_ROLE_ID = {
 }
 
 # Session storage
-sessions = {}
+# Backend is "mongo" (shared across workers/nodes, survives redeploys) or "memory" (local stand-in for dev)
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'mongo')
+SESSION_TTL_SECONDS = int(os.environ.get('SESSION_TTL_SECONDS', str(7 * 24 * 60 * 60)))
+SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', '10000'))
+SESSION_CACHE_TTL_SECONDS = int(os.environ.get('SESSION_CACHE_TTL_SECONDS', '60'))
 
-# Pending punishments storage (for Discord button callbacks)
-pending_punishments = {}
+class MemorySessionBackend:
+    """Process-local session backend (single worker / local development only)"""
+    def __init__(self):
+        self._sessions = {}  # token -> (discord_id, expires_at)
+
+    async def init(self):
+        pass
+
+    async def get(self, token: str) -> Optional[str]:
+        entry = self._sessions.get(token)
+        if not entry:
+            return None
+        discord_id, expires_at = entry
+        if expires_at <= datetime.now(timezone.utc):
+            self._sessions.pop(token, None)
+            return None
+        return discord_id
+
+    async def set(self, token: str, discord_id: str, expires_at: datetime):
+        self._sessions[token] = (discord_id, expires_at)
+
+    async def delete(self, token: str):
+        self._sessions.pop(token, None)
+
+class MongoSessionBackend:
+    """Session backend stored in the `sessions` collection, expired by a TTL index"""
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def init(self):
+        # Mongo removes documents once expires_at has passed (checked roughly every 60s)
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get(self, token: str) -> Optional[str]:
+        # Filter on expires_at as well, since the TTL monitor may lag behind
+        session_doc = await self.collection.find_one(
+            {"_id": token, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+            {"discord_id": 1}
+        )
+        return session_doc["discord_id"] if session_doc else None
+
+    async def set(self, token: str, discord_id: str, expires_at: datetime):
+        await self.collection.replace_one(
+            {"_id": token},
+            {
+                "_id": token,
+                "discord_id": discord_id,
+                "created_at": datetime.now(timezone.utc),
+                "expires_at": expires_at
+            },
+            upsert=True
+        )
+
+    async def delete(self, token: str):
+        await self.collection.delete_one({"_id": token})
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after `ttl` seconds"""
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def evict(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+class SessionStore:
+    """Session store with an in-process LRU read-through cache in front of the backend.
+
+    Cache hits cost no round trip; entries are kept for SESSION_CACHE_TTL_SECONDS so a
+    logout on another worker is picked up within that window.
+    """
+    def __init__(self, backend, max_size: int, cache_ttl: int):
+        self.backend = backend
+        self._cache = TTLCache(max_size, cache_ttl)
+
+    async def init(self):
+        await self.backend.init()
+
+    async def get(self, token: str) -> Optional[str]:
+        discord_id = self._cache.get(token)
+        if discord_id:
+            return discord_id
+
+        discord_id = await self.backend.get(token)
+        if discord_id:
+            self._cache.put(token, discord_id)
+        return discord_id
+
+    async def set(self, token: str, discord_id: str):
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=SESSION_TTL_SECONDS)
+        await self.backend.set(token, discord_id, expires_at)
+        self._cache.put(token, discord_id)
+
+    async def delete(self, token: str):
+        self._cache.evict(token)
+        await self.backend.delete(token)
+
+session_store = SessionStore(
+    MemorySessionBackend() if SESSION_BACKEND == "memory" else MongoSessionBackend(db.sessions),
+    max_size=SESSION_CACHE_SIZE,
+    cache_ttl=SESSION_CACHE_TTL_SECONDS
+)
+
+# Identifies this worker process (used to skip our own cache invalidation messages)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Resolved users cache (keyed by discord_id), invalidated by every write to db.users
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '5000'))
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '5'))
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS)
+
+async def invalidate_user_cache(discord_id: str):
+    """Evict a user from the local cache and broadcast the eviction to the other workers"""
+    user_cache.evict(discord_id)
+    await touch_member_teams(discord_id)
+    try:
+        await db.cache_invalidations.insert_one({
+            "discord_id": discord_id,
+            "origin": WORKER_ID,
+            "created_at": datetime.now(timezone.utc)
+        })
+    except Exception as e:
+        # Other workers still expire the entry after USER_CACHE_TTL_SECONDS
+        print(f"Failed to publish user cache invalidation: {e}")
+
+async def touch_member_teams(discord_id: str):
+    """Bump the version of the team(s) a user is in, so GET /staff/my-team stops answering 304"""
+    try:
+        await db.staff_teams.update_many({"members": discord_id}, {"$inc": {"version": 1}})
+    except Exception as e:
+        print(f"Failed to bump team version: {e}")
+
+async def listen_user_invalidations():
+    """Background task tailing the capped `cache_invalidations` collection (the invalidation bus)"""
+    try:
+        await db.create_collection("cache_invalidations", capped=True, size=1024 * 1024)
+    except CollectionInvalid:
+        pass  # Already exists
+
+    # Only apply messages published after this worker started
+    latest = await db.cache_invalidations.find_one({}, sort=[("$natural", -1)])
+    last_id = latest["_id"] if latest else None
+
+    while True:
+        try:
+            query = {"_id": {"$gt": last_id}} if last_id else {}
+            cursor = db.cache_invalidations.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+            while cursor.alive:
+                async for message in cursor:
+                    last_id = message["_id"]
+                    if message.get("origin") != WORKER_ID:
+                        user_cache.evict(message["discord_id"])
+                # Tailable cursors return nothing when the collection is empty
+                await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error in user cache invalidation listener: {e}")
+            user_cache.clear()
+            await asyncio.sleep(5)
 
 # Create the main app
 app = FastAPI()
@@ -69,25 +261,94 @@ api_router = APIRouter(prefix="/api")
 discord_bot_client = None
 discord_bot_ready = False
 
-class PunishmentView(discord.ui.View):
-    """Discord View for punishment approval buttons"""
-    def __init__(self, punishment_id: str):
-        super().__init__(timeout=None)  # No timeout
-        self.punishment_id = punishment_id
-    
-    @discord.ui.button(label="Godkend Straf", style=discord.ButtonStyle.green, custom_id="approve_punishment", emoji="✅")
-    async def approve_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.handle_punishment_decision(interaction, True)
-    
-    @discord.ui.button(label="Afvis Straf", style=discord.ButtonStyle.red, custom_id="reject_punishment", emoji="❌")
-    async def reject_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.handle_punishment_decision(interaction, False)
+# Discord users/members/DM channels
+# The members intent is privileged (enable it in the developer portal first). With it the
+# gateway keeps the guild's members cached and up to date, and sends the member events
+# below; without it we fall back to REST lookups kept for a short TTL.
+DISCORD_MEMBERS_INTENT = os.environ.get('DISCORD_MEMBERS_INTENT', 'false').lower() == 'true'
+DISCORD_ENTITY_CACHE_SIZE = int(os.environ.get('DISCORD_ENTITY_CACHE_SIZE', '5000'))
+DISCORD_USER_CACHE_TTL_SECONDS = int(os.environ.get('DISCORD_USER_CACHE_TTL_SECONDS', '3600'))
+DISCORD_MEMBER_CACHE_TTL_SECONDS = int(os.environ.get('DISCORD_MEMBER_CACHE_TTL_SECONDS', '300'))
+# A user's DM channel id never changes
+DISCORD_DM_CHANNEL_CACHE_TTL_SECONDS = int(os.environ.get('DISCORD_DM_CHANNEL_CACHE_TTL_SECONDS', '86400'))
+
+class DiscordEntityCache:
+    """Resolve users, guild members and DM channels without a REST call per notification"""
+    def __init__(self):
+        self.users = TTLCache(DISCORD_ENTITY_CACHE_SIZE, DISCORD_USER_CACHE_TTL_SECONDS)
+        self.members = TTLCache(DISCORD_ENTITY_CACHE_SIZE, DISCORD_MEMBER_CACHE_TTL_SECONDS)
+        self.dm_channels = TTLCache(DISCORD_ENTITY_CACHE_SIZE, DISCORD_DM_CHANNEL_CACHE_TTL_SECONDS)
+
+    async def get_user(self, user_id: int) -> discord.User:
+        user = discord_bot_client.get_user(user_id) or self.users.get(user_id)
+        if not user:
+            user = await discord_bot_client.fetch_user(user_id)
+            self.users.put(user_id, user)
+        return user
+
+    async def get_member(self, guild: discord.Guild, member_id: int) -> discord.Member:
+        # Keyed by member id alone - the bot only works in DISCORD_GUILD_ID
+        member = guild.get_member(member_id) or self.members.get(member_id)
+        if not member:
+            member = await guild.fetch_member(member_id)
+            self.members.put(member_id, member)
+        return member
+
+    async def get_dm_channel(self, user_id: int) -> discord.DMChannel:
+        """DM channel to send to; saves the fetch_user + create_dm round trips on repeat DMs"""
+        channel = self.dm_channels.get(user_id)
+        if not channel:
+            user = await self.get_user(user_id)
+            channel = user.dm_channel or await user.create_dm()
+            self.dm_channels.put(user_id, channel)
+        return channel
+
+    def evict_member(self, member_id: int):
+        """Drop a member after changing its roles, so the next lookup sees the new ones"""
+        self.members.evict(member_id)
+
+    def evict_user(self, user_id: int):
+        self.users.evict(user_id)
+        self.evict_member(user_id)
+
+discord_entities = DiscordEntityCache()
+
+class PunishmentDecisionButton(discord.ui.DynamicItem[discord.ui.Button], template=r"(?P<action>approve|reject)_punishment"):
+    """Approve/reject button on punishment messages.
+
+    Registered once on the bot and matched by custom_id, so it works on messages from before a
+    restart; the punishment itself is loaded from `punishment_approvals` by message id.
+    """
+    def __init__(self, action: str):
+        approve = action == "approve"
+        super().__init__(discord.ui.Button(
+            label="Godkend Straf" if approve else "Afvis Straf",
+            style=discord.ButtonStyle.green if approve else discord.ButtonStyle.red,
+            custom_id=f"{action}_punishment",
+            emoji="✅" if approve else "❌"
+        ))
+        self.action = action
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match):
+        return cls(match["action"])
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.handle_punishment_decision(interaction, self.action == "approve")
     
     async def handle_punishment_decision(self, interaction: discord.Interaction, approved: bool):
         """Handle punishment approval/rejection"""
         try:
-            # Get punishment details
-            punishment_data = pending_punishments.get(self.punishment_id)
+            # Claim the punishment, so a second click can't decide it again
+            punishment_data = await db.punishment_approvals.find_one_and_update(
+                {"message_id": str(interaction.message.id), "status": "pending"},
+                {"$set": {
+                    "status": "approved" if approved else "rejected",
+                    "decided_by": interaction.user.name,
+                    "decided_at": datetime.now(timezone.utc).isoformat()
+                }},
+                projection={"_id": 0}
+            )
             if not punishment_data:
                 await interaction.response.send_message("❌ Straf data ikke fundet!", ephemeral=True)
                 return
@@ -109,12 +370,12 @@ class PunishmentView(discord.ui.View):
                 embed.set_footer(text=f"✅ GODKENDT af {interaction.user.name} - {datetime.now(timezone.utc).strftime('%d/%m/%Y %H:%M')}")
                 
                 # Notify reporter
-                await send_punishment_decision_to_reporter(
-                    punishment_data["reporter_id"],
-                    punishment_data["reported_player"],
-                    True,
-                    interaction.user.name
-                )
+                await notification_outbox.enqueue("punishment_decision", f"dm:{punishment_data['reporter_id']}", {
+                    "reporter_id": punishment_data["reporter_id"],
+                    "reported_player": punishment_data["reported_player"],
+                    "approved": True,
+                    "decided_by": interaction.user.name
+                })
                 
                 await interaction.response.edit_message(embed=embed, view=None)
                 await interaction.followup.send(f"✅ Straf godkendt!", ephemeral=True)
@@ -125,40 +386,69 @@ class PunishmentView(discord.ui.View):
                 embed.set_footer(text=f"❌ AFVIST af {interaction.user.name} - {datetime.now(timezone.utc).strftime('%d/%m/%Y %H:%M')}")
                 
                 # Notify reporter
-                await send_punishment_decision_to_reporter(
-                    punishment_data["reporter_id"],
-                    punishment_data["reported_player"],
-                    False,
-                    interaction.user.name
-                )
+                await notification_outbox.enqueue("punishment_decision", f"dm:{punishment_data['reporter_id']}", {
+                    "reporter_id": punishment_data["reporter_id"],
+                    "reported_player": punishment_data["reported_player"],
+                    "approved": False,
+                    "decided_by": interaction.user.name
+                })
                 
                 await interaction.response.edit_message(embed=embed, view=None)
                 await interaction.followup.send(f"❌ Straf afvist!", ephemeral=True)
             
-            # Remove from pending
-            pending_punishments.pop(self.punishment_id, None)
-            
         except Exception as e:
             print(f"Error handling punishment decision: {e}")
             await interaction.response.send_message(f"❌ Fejl: {str(e)}", ephemeral=True)
 
+def punishment_view() -> discord.ui.View:
+    view = discord.ui.View(timeout=None)
+    view.add_item(PunishmentDecisionButton("approve"))
+    view.add_item(PunishmentDecisionButton("reject"))
+    return view
+
 class DiscordBot(discord.Client):
     def __init__(self):
         intents = discord.Intents.default()
         # No need for message_content intent - we only send messages, not read them
+        intents.members = DISCORD_MEMBERS_INTENT
         super().__init__(intents=intents)
     
+    async def setup_hook(self):
+        # Buttons on approval messages keep working across restarts
+        self.add_dynamic_items(PunishmentDecisionButton, FiringDecisionButton)
+    
     async def on_ready(self):
         global discord_bot_ready
         discord_bot_ready = True
         print(f'Discord bot logged in as {self.user}')
 
+    # Member events are only delivered with the members intent
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        discord_entities.evict_member(after.id)
+
+    async def on_member_remove(self, member: discord.Member):
+        discord_entities.evict_member(member.id)
+
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        discord_entities.evict_user(after.id)
+
 async def init_discord_bot():
     global discord_bot_client
     if DISCORD_BOT_TOKEN and not discord_bot_client:
         discord_bot_client = DiscordBot()
         asyncio.create_task(discord_bot_client.start(DISCORD_BOT_TOKEN))
 
+async def stop_discord_bot():
+    global discord_bot_client, discord_bot_ready
+    if not discord_bot_client:
+        return
+    bot, discord_bot_client, discord_bot_ready = discord_bot_client, None, False
+    # Cached users/members/channels belong to the closed client
+    discord_entities.users.clear()
+    discord_entities.members.clear()
+    discord_entities.dm_channels.clear()
+    await bot.close()
+
 async def send_discord_embed(user_id: str, username: str, app_type: str, status: str, reviewed_by: str, head_admin_id: str = None, team_name: str = None):
     """Send Discord embed notification"""
     if not discord_bot_client or not discord_bot_ready:
@@ -203,7 +493,7 @@ async def send_discord_embed(user_id: str, username: str, app_type: str, status:
         # Also send DM to approved staff member
         if status == "approved" and app_type.lower() == "staff" and head_admin_id and team_name:
             try:
-                user = await discord_bot_client.fetch_user(int(user_id))
+                user = await discord_entities.get_dm_channel(int(user_id))
                 if user:
                     dm_embed = discord.Embed(
                         title="🎉 Velkommen til Staff Teamet!",
@@ -227,6 +517,7 @@ async def send_discord_embed(user_id: str, username: str, app_type: str, status:
         
     except Exception as e:
         print(f"Failed to send Discord embed: {e}")
+        raise
 
 async def send_punishment_decision_to_reporter(reporter_id: str, reported_player: str, approved: bool, decided_by: str):
     """Notify reporter about punishment decision"""
@@ -234,7 +525,7 @@ async def send_punishment_decision_to_reporter(reporter_id: str, reported_player
         return
     
     try:
-        reporter_user = await discord_bot_client.fetch_user(int(reporter_id))
+        reporter_user = await discord_entities.get_dm_channel(int(reporter_id))
         if not reporter_user:
             return
         
@@ -265,6 +556,7 @@ async def send_punishment_decision_to_reporter(reporter_id: str, reported_player
         
     except Exception as e:
         print(f"Error sending decision to reporter: {e}")
+        raise
 
 async def send_punishment_to_channel(report_id: str, reported_player: str, report_type: str, punishment_type: str, punishment_duration: str, handled_by: str, description: str, evidence: str = None, reporter_id: str = None):
     """Send punishment notification to Discord punishment channel with approval buttons"""
@@ -328,27 +620,33 @@ async def send_punishment_to_channel(report_id: str, reported_player: str, repor
         
         embed.set_footer(text="⏳ Afventer Godkendelse")
         
-        # Store punishment data for button callback
+        # Store punishment data for button callback (looked up by message id)
         punishment_id = f"{report_id}_{datetime.now(timezone.utc).timestamp()}"
-        pending_punishments[punishment_id] = {
+        await db.punishment_approvals.insert_one({
+            "id": punishment_id,
+            "message_id": None,
+            "status": "pending",
             "report_id": report_id,
             "reported_player": reported_player,
             "punishment_type": punishment_type,
             "punishment_duration": punishment_duration,
             "description": description,
-            "reporter_id": reporter_id
-        }
-        
-        # Create view with buttons
-        view = PunishmentView(punishment_id)
+            "reporter_id": reporter_id,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
         
-        await channel.send(embed=embed, view=view)
+        message = await channel.send(embed=embed, view=punishment_view())
+        await db.punishment_approvals.update_one(
+            {"id": punishment_id},
+            {"$set": {"message_id": str(message.id)}}
+        )
         print(f"[PUNISHMENT SUCCESS] Notification with buttons sent to channel for {reported_player}")
         
     except Exception as e:
         print(f"[PUNISHMENT ERROR] Error sending punishment to channel: {e}")
         import traceback
         traceback.print_exc()
+        raise
 
 async def send_report_status_notification(reporter_id: str, reporter_username: str, report_id: str, reported_player: str, report_type: str, new_status: str, handled_by: str, admin_notes: str = None, punishment_type: str = None, punishment_duration: str = None):
     """Send DM to reporter when their report status is updated"""
@@ -358,7 +656,7 @@ async def send_report_status_notification(reporter_id: str, reporter_username: s
     
     try:
         # Get reporter user
-        reporter_user = await discord_bot_client.fetch_user(int(reporter_id))
+        reporter_user = await discord_entities.get_dm_channel(int(reporter_id))
         if not reporter_user:
             print(f"Reporter {reporter_id} not found")
             return
@@ -428,6 +726,7 @@ async def send_report_status_notification(reporter_id: str, reporter_username: s
         print(f"Cannot send DM to {reporter_username} - DMs are disabled")
     except Exception as e:
         print(f"Error sending report notification: {e}")
+        raise
 
 async def send_strike_notification_dm(staff_discord_id: str, staff_username: str, strike_number: int, reason: str, added_by: str):
     """Send DM to staff member when they receive a strike"""
@@ -437,7 +736,7 @@ async def send_strike_notification_dm(staff_discord_id: str, staff_username: str
     
     try:
         # Get staff user
-        staff_user = await discord_bot_client.fetch_user(int(staff_discord_id))
+        staff_user = await discord_entities.get_dm_channel(int(staff_discord_id))
         if not staff_user:
             print(f"Staff user {staff_discord_id} not found")
             return
@@ -476,6 +775,7 @@ async def send_strike_notification_dm(staff_discord_id: str, staff_username: str
         print(f"Cannot send DM to {staff_username} - DMs are disabled")
     except Exception as e:
         print(f"Error sending strike notification: {e}")
+        raise
 
 async def send_staff_assignment_dm(head_admin_id: str, new_staff_username: str, new_staff_id: str, team_name: str):
     """Send DM to head admin about new staff member with guide"""
@@ -485,7 +785,7 @@ async def send_staff_assignment_dm(head_admin_id: str, new_staff_username: str,
     
     try:
         # Get head admin user
-        head_admin = await discord_bot_client.fetch_user(int(head_admin_id))
+        head_admin = await discord_entities.get_dm_channel(int(head_admin_id))
         if not head_admin:
             print(f"Head admin {head_admin_id} not found")
             return
@@ -531,6 +831,34 @@ God fornøjelse med dit nye team medlem! 🚀
         print(f"Sent staff assignment DM to head admin {head_admin_id}")
     except Exception as e:
         print(f"Failed to send staff assignment DM: {e}")
+        raise
+
+async def send_probation_complete_dm(discord_id: str, username: str):
+    """Send DM to staff member when their probation period is over"""
+    if not discord_bot_client or not discord_bot_ready:
+        print("Discord bot not ready")
+        return
+    
+    try:
+        discord_user = await discord_entities.get_dm_channel(int(discord_id))
+        embed = discord.Embed(
+            title="🎉 Probation Afsluttet!",
+            description=f"Tillykke **{username}**! Du har gennemført din probation periode.",
+            color=discord.Color.green(),
+            timestamp=datetime.now(timezone.utc)
+        )
+        embed.add_field(
+            name="✅ Hvad betyder det?",
+            value="• Du er nu fuldt staff medlem\n• Du har fået din permanente staff rolle\n• Fortsæt det gode arbejde!",
+            inline=False
+        )
+        embed.set_footer(text="Redicate RP Staff System")
+        await discord_user.send(embed=embed)
+    except discord.Forbidden:
+        print(f"Cannot send DM to {username} - DMs are disabled")
+    except Exception as e:
+        print(f"Could not send probation completion DM: {e}")
+        raise
 
 async def send_transfer_notifications(
     staff_discord_id: str,
@@ -549,7 +877,7 @@ async def send_transfer_notifications(
     try:
         # 1. DM to the transferred staff member
         try:
-            staff_user = await discord_bot_client.fetch_user(int(staff_discord_id))
+            staff_user = await discord_entities.get_dm_channel(int(staff_discord_id))
             if staff_user:
                 staff_embed = discord.Embed(
                     title="🔄 Du er blevet overført til et nyt team!",
@@ -592,7 +920,7 @@ async def send_transfer_notifications(
         # 2. DM to old head admin (if exists)
         if old_head_admin_id:
             try:
-                old_head_admin = await discord_bot_client.fetch_user(int(old_head_admin_id))
+                old_head_admin = await discord_entities.get_dm_channel(int(old_head_admin_id))
                 if old_head_admin:
                     old_ha_embed = discord.Embed(
                         title="📤 Staff medlem overført fra dit team",
@@ -629,7 +957,7 @@ async def send_transfer_notifications(
         
         # 3. DM to new head admin
         try:
-            new_head_admin = await discord_bot_client.fetch_user(int(new_head_admin_id))
+            new_head_admin = await discord_entities.get_dm_channel(int(new_head_admin_id))
             if new_head_admin:
                 new_ha_embed = discord.Embed(
                     title="📥 Nyt staff medlem overført til dit team!",
@@ -687,7 +1015,7 @@ async def give_probation_role(discord_id: str):
             print(f"❌ Guild {DISCORD_GUILD_ID} not found")
             return False
         
-        member = await guild.fetch_member(int(discord_id))
+        member = await discord_entities.get_member(guild, int(discord_id))
         if not member:
             print(f"❌ Member {discord_id} not found in guild")
             return False
@@ -706,6 +1034,9 @@ async def give_probation_role(discord_id: str):
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        # member.roles on the cached object is stale after an edit
+        discord_entities.evict_member(int(discord_id))
 
 async def upgrade_from_probation(discord_id: str):
     """Upgrade staff member from probation to full staff"""
@@ -719,7 +1050,7 @@ async def upgrade_from_probation(discord_id: str):
             print(f"❌ Guild {DISCORD_GUILD_ID} not found")
             return False
         
-        member = await guild.fetch_member(int(discord_id))
+        member = await discord_entities.get_member(guild, int(discord_id))
         if not member:
             print(f"❌ Member {discord_id} not found in guild")
             return False
@@ -743,6 +1074,8 @@ async def upgrade_from_probation(discord_id: str):
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        discord_entities.evict_member(int(discord_id))
 
 async def update_discord_roles(discord_id: str, new_rank: str, remove_all_ranks: bool = False):
     """Update Discord roles for staff member"""
@@ -758,49 +1091,35 @@ async def update_discord_roles(discord_id: str, new_rank: str, remove_all_ranks:
         
         print(f"✅ Found guild: {guild.name}")
         
-        member = await guild.fetch_member(int(discord_id))
+        member = await discord_entities.get_member(guild, int(discord_id))
         if not member:
             print(f"❌ Member {discord_id} not found in guild")
             return False
         
         print(f"✅ Found member: {member.name}")
         
+        # Only the rank roles and the perm staff role are touched; everything else is kept
+        managed_ids = role_ids(*RANK_TO_ROLE_ID.values(), DISCORD_PERM_STAFF_ROLE_ID)
+        
         # Remove all rank roles if specified (for firing)
         if remove_all_ranks:
-            for role_id in RANK_TO_ROLE_ID.values():
-                role = guild.get_role(int(role_id))
-                if role and role in member.roles:
-                    await member.remove_roles(role)
-            
-            # Remove perm staff role
-            perm_role = guild.get_role(int(DISCORD_PERM_STAFF_ROLE_ID))
-            if perm_role and perm_role in member.roles:
-                await member.remove_roles(perm_role)
-            
+            await apply_member_roles(member, set(), managed_ids)
             print(f"Removed all staff roles from {discord_id}")
             return True
         
-        # Add perm staff role if not present
-        perm_role = guild.get_role(int(DISCORD_PERM_STAFF_ROLE_ID))
-        if perm_role and perm_role not in member.roles:
-            await member.add_roles(perm_role)
-        
-        # Remove all rank roles first
-        for role_id in RANK_TO_ROLE_ID.values():
-            role = guild.get_role(int(role_id))
-            if role and role in member.roles:
-                await member.remove_roles(role)
-        
-        # Add new rank role
+        # Perm staff role plus the new rank role, replacing any previous rank
+        target_ids = role_ids(DISCORD_PERM_STAFF_ROLE_ID)
         new_role_id = RANK_TO_ROLE_ID.get(new_rank)
-        if new_role_id:
-            new_role = guild.get_role(int(new_role_id))
-            if new_role:
-                await member.add_roles(new_role)
-                print(f"✅ Updated {discord_id} ({member.name}) to rank {new_rank}")
-                return True
-            else:
-                print(f"❌ Role {new_role_id} not found in guild")
+        new_role = guild.get_role(int(new_role_id)) if new_role_id else None
+        if new_role:
+            target_ids.add(new_role.id)
+        await apply_member_roles(member, target_ids & {role.id for role in guild.roles}, managed_ids)
+        
+        if new_role:
+            print(f"✅ Updated {discord_id} ({member.name}) to rank {new_rank}")
+            return True
+        elif new_role_id:
+            print(f"❌ Role {new_role_id} not found in guild")
         else:
             print(f"❌ No role mapping for rank {new_rank}")
         
@@ -810,15 +1129,330 @@ async def update_discord_roles(discord_id: str, new_rank: str, remove_all_ranks:
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        discord_entities.evict_member(int(discord_id))
+
+def role_ids(*values) -> set:
+    """Role ids from the (possibly unset) env settings"""
+    return {int(value) for value in values if value}
+
+async def apply_member_roles(member: discord.Member, target_ids: set, managed_ids: set) -> bool:
+    """Make the member's managed roles exactly target_ids with a single member edit.
+
+    Roles outside managed_ids are left alone. Returns False when nothing had to change.
+    """
+    current_ids = {role.id for role in member.roles if not role.is_default()}
+    desired_ids = (current_ids - managed_ids) | target_ids
+    if desired_ids == current_ids:
+        return False
+    await member.edit(roles=[discord.Object(id=role_id) for role_id in desired_ids])
+    discord_entities.evict_member(member.id)
+    return True
+
+async def staff_team_member_ids(team_id: Optional[str] = None) -> List[str]:
+    """Discord ids of the members of one staff team, or of every team.
+
+    Team membership decides who holds staff roles: users.role is rewritten from Discord at every
+    login, so it can't tell a probation member or a head admin sitting in a team apart from a player.
+    Head admins themselves are not team members and keep their roles by hand.
+    """
+    query = {"id": team_id} if team_id else {}
+    teams = await db.staff_teams.find(query, {"_id": 0, "members": 1}).to_list(None)
+    return sorted({discord_id for team in teams for discord_id in team.get("members", [])})
+
+def staff_role_targets(user_doc: dict) -> Optional[set]:
+    """Discord staff roles a staff team member should have according to Mongo.
+
+    None when the member has no rank set (e.g. added by hand before ranks existed): their rank
+    role can't be derived, so it is left alone instead of being reset to mod_elev.
+    """
+    if user_doc.get("on_probation"):
+        return role_ids(DISCORD_PROBATION_ROLE_ID)
+    if not user_doc.get("staff_rank"):
+        return None
+    return role_ids(DISCORD_PERM_STAFF_ROLE_ID, RANK_TO_ROLE_ID.get(user_doc["staff_rank"]))
+
+# Full roster sync: corrections are spread out in batches to stay clear of the member-edit rate limit
+ROLE_SYNC_INTERVAL_SECONDS = int(os.environ.get('ROLE_SYNC_INTERVAL_SECONDS', str(6 * 60 * 60)))
+ROLE_SYNC_BATCH_SIZE = int(os.environ.get('ROLE_SYNC_BATCH_SIZE', '10'))
+ROLE_SYNC_BATCH_PAUSE_SECONDS = float(os.environ.get('ROLE_SYNC_BATCH_PAUSE_SECONDS', '5'))
+ROLE_SYNC_REPORT_ID = "role_sync"
+# The periodic full sync only reports drift unless this is on; a sync asked for in the panel corrects it
+ROLE_SYNC_APPLY_CORRECTIONS = os.environ.get('ROLE_SYNC_APPLY_CORRECTIONS', 'false').lower() == 'true'
+
+async def scan_guild_members(guild: discord.Guild) -> dict:
+    """Every guild member from the gateway - one chunk request instead of a fetch per member"""
+    if not guild.chunked:
+        await guild.chunk()
+    return {member.id: member for member in guild.members}
+
+async def reconcile_staff_roles(team_id: Optional[str] = None, apply: bool = True) -> dict:
+    """Bring the Discord staff roles of one team's members (default: every team) in line with Mongo.
+
+    With apply=False the drift is only reported. A full run scans the whole guild when the
+    members intent is enabled. The report is stored for GET /super-admin/staff/sync-roles.
+    """
+    guild = discord_bot_client.get_guild(int(DISCORD_GUILD_ID))
+    if not guild:
+        raise RuntimeError(f"Guild {DISCORD_GUILD_ID} not found")
+    
+    started = time.monotonic()
+    managed_ids = role_ids(*RANK_TO_ROLE_ID.values(), DISCORD_PERM_STAFF_ROLE_ID, DISCORD_PROBATION_ROLE_ID)
+    guild_role_ids = {role.id for role in guild.roles}
+    users = await db.users.find(
+        {"discord_id": {"$in": await staff_team_member_ids(team_id)}},
+        {"_id": 0, "discord_id": 1, "staff_rank": 1, "on_probation": 1}
+    ).to_list(None)
+    
+    members = await scan_guild_members(guild) if team_id is None and DISCORD_MEMBERS_INTENT else None
+    result = {
+        "mode": "guild_scan" if members is not None else "per_member",
+        "applied": apply,
+        "checked": len(users),
+        "in_sync": 0,
+        "drifted": 0,
+        "corrected": 0,
+        "failed": 0,
+        "missing": 0,
+        "no_rank": 0
+    }
+    
+    drifted = []
+    for user_doc in users:
+        if members is not None:
+            member = members.get(int(user_doc["discord_id"]))
+        else:
+            try:
+                member = await discord_entities.get_member(guild, int(user_doc["discord_id"]))
+            except discord.NotFound:
+                member = None
+            except Exception as e:
+                print(f"❌ Failed to look up member {user_doc['discord_id']}: {e}")
+                result["failed"] += 1
+                continue
+        if not member:
+            result["missing"] += 1
+            continue
+        target_ids = staff_role_targets(user_doc)
+        if target_ids is None:
+            result["no_rank"] += 1
+            continue
+        target_ids &= guild_role_ids
+        if {role.id for role in member.roles} & managed_ids == target_ids:
+            result["in_sync"] += 1
+        else:
+            drifted.append((member, target_ids))
+    result["drifted"] = len(drifted)
+    result["drift"] = [
+        {
+            "discord_id": str(member.id),
+            "missing_role_ids": sorted(str(role_id) for role_id in target_ids - {role.id for role in member.roles}),
+            "extra_role_ids": sorted(str(role.id) for role in member.roles if role.id in managed_ids - target_ids)
+        }
+        for member, target_ids in drifted
+    ]
+    
+    for i, (member, target_ids) in enumerate(drifted if apply else []):
+        if i and i % ROLE_SYNC_BATCH_SIZE == 0:
+            await asyncio.sleep(ROLE_SYNC_BATCH_PAUSE_SECONDS)
+        try:
+            await apply_member_roles(member, target_ids, managed_ids)
+            result["corrected"] += 1
+        except Exception as e:
+            print(f"❌ Failed to sync roles of {member.id}: {e}")
+            result["failed"] += 1
+    
+    if members is not None:
+        # Staff roles on people outside every staff team (e.g. head admins). Only reported:
+        # their roles are managed by hand, so there is no safe target to apply.
+        staff_ids = {int(user_doc["discord_id"]) for user_doc in users}
+        result["unexpected_role_holders"] = [
+            str(member.id) for member in members.values()
+            if member.id not in staff_ids and any(role.id in managed_ids for role in member.roles)
+        ]
+    
+    result["duration_seconds"] = round(time.monotonic() - started, 2)
+    result["finished_at"] = datetime.now(timezone.utc).isoformat()
+    report_id = role_sync_report_id(team_id)
+    await db.stats.replace_one({"_id": report_id}, {"_id": report_id, "team_id": team_id, **result}, upsert=True)
+    return result
 
-async def notify_firing_request(staff_username: str, staff_id: str, head_admin_username: str, head_admin_id: str, strikes: List[dict]):
+def role_sync_report_id(team_id: Optional[str] = None) -> str:
+    """stats document holding the last role sync report of a team, or of the whole roster"""
+    return f"{ROLE_SYNC_REPORT_ID}:{team_id}" if team_id else ROLE_SYNC_REPORT_ID
+
+async def sync_staff_roles_periodically():
+    """Background task reporting drift between the staff roster and Discord roles (corrected with ROLE_SYNC_APPLY_CORRECTIONS)"""
+    while True:
+        await asyncio.sleep(ROLE_SYNC_INTERVAL_SECONDS)
+        if not discord_bot_client or not discord_bot_ready:
+            continue
+        try:
+            result = await reconcile_staff_roles(apply=ROLE_SYNC_APPLY_CORRECTIONS)
+            print(f"Role sync: {result['drifted']} drifted, {result['corrected']} corrected, {result['failed']} failed")
+        except Exception as e:
+            print(f"Error syncing staff roles: {e}")
+
+class FiringDecisionButton(discord.ui.DynamicItem[discord.ui.Button], template=r"firing_(?P<action>approve|reject)_(?P<request_id>[\w-]+)"):
+    """Approve/reject button on firing requests; the request id is parsed back out of the custom_id"""
+    def __init__(self, action: str, request_id: str):
+        approve = action == "approve"
+        super().__init__(discord.ui.Button(
+            label="✅ Godkend Fyring" if approve else "❌ Afvis Fyring",
+            style=discord.ButtonStyle.success if approve else discord.ButtonStyle.danger,
+            custom_id=f"firing_{action}_{request_id}"
+        ))
+        self.action = action
+        self.request_id = request_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match):
+        return cls(match["action"], match["request_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        if self.action == "approve":
+            await self.approve_callback(interaction)
+        else:
+            await self.reject_callback(interaction)
+    
+    async def approve_callback(self, interaction: discord.Interaction):
+        # Check if user is authorized
+        if str(interaction.user.id) != DISCORD_FIRING_APPROVER_USER_ID:
+            await interaction.response.send_message(
+                "❌ Du har ikke rettigheder til at godkende fyringer!",
+                ephemeral=True
+            )
+            return
+
+        # Update firing request in database
+        await db.firing_requests.update_one(
+            {"id": self.request_id},
+            {"$set": {
+                "status": "approved",
+                "reviewed_by": str(interaction.user.id),
+                "reviewed_at": datetime.now(timezone.utc).isoformat()
+            }}
+        )
+
+        # Get firing request details
+        firing_req = await db.firing_requests.find_one({"id": self.request_id}, {"_id": 0})
+
+        # Fire the staff member (remove all roles)
+        await update_discord_roles(firing_req["staff_id"], None, True)
+
+        # Update user in database
+        await db.users.update_one(
+            {"discord_id": firing_req["staff_id"]},
+            {"$set": {
+                "role": "player",
+                "is_admin": False,
+                "is_head_admin": False,
+                "team_id": None,
+                "staff_rank": None
+            }}
+        )
+        await invalidate_user_cache(firing_req["staff_id"])
+
+        # Send DM to fired staff member
+        try:
+            fired_user = await discord_entities.get_dm_channel(int(firing_req["staff_id"]))
+            if fired_user:
+                dm_embed = discord.Embed(
+                    title="⚠️ Staff Fyring",
+                    description=f"Hej **{firing_req['staff_username']}**,\n\nDu er blevet fyret fra staff teamet.",
+                    color=discord.Color.red(),
+                    timestamp=datetime.now(timezone.utc)
+                )
+                dm_embed.add_field(
+                    name="📋 Årsag",
+                    value=firing_req["reason"],
+                    inline=False
+                )
+                dm_embed.add_field(
+                    name="⚠️ Strikes",
+                    value="\n".join([f"**Strike {i+1}:** {s['reason']}" for i, s in enumerate(firing_req["strikes"])]),
+                    inline=False
+                )
+                dm_embed.add_field(
+                    name="ℹ️ Hvad Nu?",
+                    value="Dine staff roller er blevet fjernet. Hvis du har spørgsmål, kontakt server ledelsen.",
+                    inline=False
+                )
+                dm_embed.set_footer(text="Redicate RP Staff System")
+
+                await fired_user.send(embed=dm_embed)
+                print(f"Sent firing DM to {firing_req['staff_username']}")
+        except Exception as dm_error:
+            print(f"Could not send firing DM: {dm_error}")
+
+        # Update embed
+        embed = interaction.message.embeds[0]
+        embed.color = discord.Color.green()
+        embed.title = "✅ Fyring Godkendt"
+        embed.add_field(
+            name="Godkendt af", 
+            value=f"<@{interaction.user.id}>", 
+            inline=False
+        )
+
+        await interaction.response.edit_message(embed=embed, view=None)
+        await interaction.followup.send(
+            f"✅ {firing_req['staff_username']} er blevet fyret og fjernet fra teamet. DM sendt.",
+            ephemeral=True
+        )
+
+    async def reject_callback(self, interaction: discord.Interaction):
+        # Check if user is authorized
+        if str(interaction.user.id) != DISCORD_FIRING_APPROVER_USER_ID:
+            await interaction.response.send_message(
+                "❌ Du har ikke rettigheder til at afvise fyringer!",
+                ephemeral=True
+            )
+            return
+
+        # Update firing request in database
+        await db.firing_requests.update_one(
+            {"id": self.request_id},
+            {"$set": {
+                "status": "rejected",
+                "reviewed_by": str(interaction.user.id),
+                "reviewed_at": datetime.now(timezone.utc).isoformat()
+            }}
+        )
+
+        firing_req = await db.firing_requests.find_one({"id": self.request_id}, {"_id": 0})
+
+        # Update embed
+        embed = interaction.message.embeds[0]
+        embed.color = discord.Color.orange()
+        embed.title = "❌ Fyring Afvist"
+        embed.add_field(
+            name="Afvist af", 
+            value=f"<@{interaction.user.id}>", 
+            inline=False
+        )
+
+        await interaction.response.edit_message(embed=embed, view=None)
+        await interaction.followup.send(
+            f"❌ Fyring anmodning for {firing_req['staff_username']} er blevet afvist.",
+            ephemeral=True
+        )
+
+def firing_view(request_id: str) -> discord.ui.View:
+    view = discord.ui.View(timeout=None)
+    view.add_item(FiringDecisionButton("approve", request_id))
+    view.add_item(FiringDecisionButton("reject", request_id))
+    return view
+
+async def notify_firing_request(staff_username: str, staff_id: str, head_admin_username: str, head_admin_id: str, strikes: List[dict], request_id: str):
     """Notify approver role about firing request with interactive buttons"""
     if not discord_bot_client or not discord_bot_ready:
         return
     
     try:
-        # Create firing request in database
+        # Create firing request in database (keyed by request_id, so a retried job doesn't duplicate it)
         firing_request = FiringRequest(
+            id=request_id,
             staff_id=staff_id,
             staff_username=staff_username,
             head_admin_id=head_admin_id,
@@ -826,12 +1460,11 @@ async def notify_firing_request(staff_username: str, staff_id: str, head_admin_u
             reason=f"{len(strikes)} strikes opnået",
             strikes=strikes
         )
-        await db.firing_requests.insert_one(firing_request.model_dump())
+        await db.firing_requests.replace_one({"id": request_id}, firing_request.model_dump(), upsert=True)
         
         channel = discord_bot_client.get_channel(int(DISCORD_FIRING_CHANNEL_ID))
         if not channel:
-            print(f"Firing channel {DISCORD_FIRING_CHANNEL_ID} not found")
-            return
+            raise RuntimeError(f"Firing channel {DISCORD_FIRING_CHANNEL_ID} not found")
         
         # Build strikes list
         strikes_text = "\n".join([
@@ -852,155 +1485,7 @@ async def notify_firing_request(staff_username: str, staff_id: str, head_admin_u
         embed.add_field(name="🆔 Request ID", value=f"`{firing_request.id}`", inline=False)
         embed.set_footer(text="Redicate RP Staff System • Brug knapperne nedenfor")
         
-        # Create buttons view
-        from discord.ui import View, Button
-        
-        class FiringApprovalView(View):
-            def __init__(self, request_id: str):
-                super().__init__(timeout=None)  # No timeout
-                self.request_id = request_id
-                
-                # Approve button
-                approve_btn = Button(
-                    label="✅ Godkend Fyring",
-                    style=discord.ButtonStyle.success,
-                    custom_id=f"firing_approve_{request_id}"
-                )
-                approve_btn.callback = self.approve_callback
-                self.add_item(approve_btn)
-                
-                # Reject button
-                reject_btn = Button(
-                    label="❌ Afvis Fyring",
-                    style=discord.ButtonStyle.danger,
-                    custom_id=f"firing_reject_{request_id}"
-                )
-                reject_btn.callback = self.reject_callback
-                self.add_item(reject_btn)
-            
-            async def approve_callback(self, interaction: discord.Interaction):
-                # Check if user is authorized
-                if str(interaction.user.id) != DISCORD_FIRING_APPROVER_USER_ID:
-                    await interaction.response.send_message(
-                        "❌ Du har ikke rettigheder til at godkende fyringer!",
-                        ephemeral=True
-                    )
-                    return
-                
-                # Update firing request in database
-                await db.firing_requests.update_one(
-                    {"id": self.request_id},
-                    {"$set": {
-                        "status": "approved",
-                        "reviewed_by": str(interaction.user.id),
-                        "reviewed_at": datetime.now(timezone.utc).isoformat()
-                    }}
-                )
-                
-                # Get firing request details
-                firing_req = await db.firing_requests.find_one({"id": self.request_id}, {"_id": 0})
-                
-                # Fire the staff member (remove all roles)
-                await update_discord_roles(firing_req["staff_id"], None, True)
-                
-                # Update user in database
-                await db.users.update_one(
-                    {"discord_id": firing_req["staff_id"]},
-                    {"$set": {
-                        "role": "player",
-                        "is_admin": False,
-                        "is_head_admin": False,
-                        "team_id": None,
-                        "staff_rank": None
-                    }}
-                )
-                
-                # Send DM to fired staff member
-                try:
-                    fired_user = await discord_bot_client.fetch_user(int(firing_req["staff_id"]))
-                    if fired_user:
-                        dm_embed = discord.Embed(
-                            title="⚠️ Staff Fyring",
-                            description=f"Hej **{firing_req['staff_username']}**,\n\nDu er blevet fyret fra staff teamet.",
-                            color=discord.Color.red(),
-                            timestamp=datetime.now(timezone.utc)
-                        )
-                        dm_embed.add_field(
-                            name="📋 Årsag",
-                            value=firing_req["reason"],
-                            inline=False
-                        )
-                        dm_embed.add_field(
-                            name="⚠️ Strikes",
-                            value="\n".join([f"**Strike {i+1}:** {s['reason']}" for i, s in enumerate(firing_req["strikes"])]),
-                            inline=False
-                        )
-                        dm_embed.add_field(
-                            name="ℹ️ Hvad Nu?",
-                            value="Dine staff roller er blevet fjernet. Hvis du har spørgsmål, kontakt server ledelsen.",
-                            inline=False
-                        )
-                        dm_embed.set_footer(text="Redicate RP Staff System")
-                        
-                        await fired_user.send(embed=dm_embed)
-                        print(f"Sent firing DM to {firing_req['staff_username']}")
-                except Exception as dm_error:
-                    print(f"Could not send firing DM: {dm_error}")
-                
-                # Update embed
-                embed = interaction.message.embeds[0]
-                embed.color = discord.Color.green()
-                embed.title = "✅ Fyring Godkendt"
-                embed.add_field(
-                    name="Godkendt af", 
-                    value=f"<@{interaction.user.id}>", 
-                    inline=False
-                )
-                
-                await interaction.response.edit_message(embed=embed, view=None)
-                await interaction.followup.send(
-                    f"✅ {firing_req['staff_username']} er blevet fyret og fjernet fra teamet. DM sendt.",
-                    ephemeral=True
-                )
-            
-            async def reject_callback(self, interaction: discord.Interaction):
-                # Check if user is authorized
-                if str(interaction.user.id) != DISCORD_FIRING_APPROVER_USER_ID:
-                    await interaction.response.send_message(
-                        "❌ Du har ikke rettigheder til at afvise fyringer!",
-                        ephemeral=True
-                    )
-                    return
-                
-                # Update firing request in database
-                await db.firing_requests.update_one(
-                    {"id": self.request_id},
-                    {"$set": {
-                        "status": "rejected",
-                        "reviewed_by": str(interaction.user.id),
-                        "reviewed_at": datetime.now(timezone.utc).isoformat()
-                    }}
-                )
-                
-                firing_req = await db.firing_requests.find_one({"id": self.request_id}, {"_id": 0})
-                
-                # Update embed
-                embed = interaction.message.embeds[0]
-                embed.color = discord.Color.orange()
-                embed.title = "❌ Fyring Afvist"
-                embed.add_field(
-                    name="Afvist af", 
-                    value=f"<@{interaction.user.id}>", 
-                    inline=False
-                )
-                
-                await interaction.response.edit_message(embed=embed, view=None)
-                await interaction.followup.send(
-                    f"❌ Fyring anmodning for {firing_req['staff_username']} er blevet afvist.",
-                    ephemeral=True
-                )
-        
-        view = FiringApprovalView(firing_request.id)
+        view = firing_view(firing_request.id)
         message = await channel.send(embed=embed, view=view)
         
         # Save message ID for reference
@@ -1014,6 +1499,25 @@ async def notify_firing_request(staff_username: str, staff_id: str, head_admin_u
         print(f"Failed to send firing notification: {e}")
         import traceback
         traceback.print_exc()
+        raise
+
+async def request_firing(staff_id: str, staff_username: str, head_admin_id: str, head_admin_username: str, request_id: str):
+    """Outbox job queued by add_strike at 3 strikes: collect the strikes and ask for approval"""
+    strikes_list = await db.staff_notes.find(
+        {"discord_id": staff_id, "type": "strike", "active": True},
+        {"_id": 0, "text": 1, "added_by": 1, "added_at": 1}
+    ).sort([("added_at", 1), ("id", 1)]).to_list(None)
+    for strike in strikes_list:
+        strike["reason"] = strike.pop("text")
+    
+    await notify_firing_request(
+        staff_username,
+        staff_id,
+        head_admin_username,
+        head_admin_id,
+        strikes_list,
+        request_id
+    )
 
 # Models
 class User(BaseModel):
@@ -1025,9 +1529,8 @@ class User(BaseModel):
     is_head_admin: bool = False
     role: Optional[str] = "player"  # player, staff, head_admin, super_admin, staff_member
     team_id: Optional[str] = None  # Staff team ID
-    staff_rank: Optional[str] = "mod_elev"  # mod_elev, moderator, administrator, senior_admin
+    staff_rank: Optional[str] = None  # mod_elev, moderator, administrator, senior_admin (set when they join a team)
     strikes: int = 0
-    notes: List[dict] = []  # [{text: str, added_by: str, added_at: str}]
     on_probation: bool = False  # True if in probation period
     probation_end_date: Optional[str] = None  # ISO datetime when probation ends
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
@@ -1039,6 +1542,7 @@ class StaffTeam(BaseModel):
     description: str
     head_admin_id: str  # Discord ID of head admin
     members: List[str] = []  # Discord IDs of team members
+    version: int = 0  # Bumped on every change to the team or its members (ETag of GET /staff/my-team)
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 class StaffTeamCreate(BaseModel):
@@ -1060,6 +1564,23 @@ class AddNoteRequest(BaseModel):
 class UpRankRequest(BaseModel):
     new_rank: Literal["mod_elev", "moderator", "administrator", "senior_admin"]
 
+class StaffNote(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    discord_id: str  # Staff member the note is about
+    type: Literal["strike", "note", "uprank", "strike_removed"]
+    text: str
+    added_by: str
+    added_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    strike_number: Optional[int] = None  # strike / strike_removed: strike count after the change
+    reason: Optional[str] = None  # strike
+    active: Optional[bool] = None  # strike: False once removed by remove_strike
+    removed_at: Optional[str] = None  # strike
+    removed_by: Optional[str] = None  # strike
+    strike_id: Optional[str] = None  # strike_removed: the strike that was removed
+    old_rank: Optional[str] = None  # uprank
+    new_rank: Optional[str] = None  # uprank
+
 class ApplicationType(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -1092,6 +1613,21 @@ class Application(BaseModel):
     reviewed_by: Optional[str] = None
     reviewed_at: Optional[str] = None
 
+class ApplicationSummary(BaseModel):
+    """Application without the answers, for list views"""
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    user_id: str
+    username: str
+    application_type_id: str
+    application_type_name: str
+    status: str
+    submitted_at: str
+    reviewed_by: Optional[str] = None
+    reviewed_at: Optional[str] = None
+
+APPLICATION_SUMMARY_PROJECTION = {"_id": 0, **{field: 1 for field in ApplicationSummary.model_fields}}
+
 class ApplicationCreate(BaseModel):
     application_type_id: str
     answers: dict
@@ -1131,6 +1667,22 @@ class Report(BaseModel):
     punishment_type: Optional[str] = None  # "ban", "warn", "none"
     punishment_duration: Optional[str] = None  # "permanent", "1 day", "3 days", "7 days", etc.
 
+class ReportSummary(BaseModel):
+    """Report without the free-text fields, for list views"""
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    reporter_id: str
+    reporter_username: str
+    reported_player: str
+    report_type: str
+    status: str
+    submitted_at: str
+    handled_by: Optional[str] = None
+    handled_at: Optional[str] = None
+    punishment_type: Optional[str] = None
+
+REPORT_SUMMARY_PROJECTION = {"_id": 0, **{field: 1 for field in ReportSummary.model_fields}}
+
 class ReportCreate(BaseModel):
     reported_player: str
     report_type: str
@@ -1143,23 +1695,192 @@ class ReportUpdate(BaseModel):
     punishment_type: Optional[str] = None  # "ban", "warn", "none"
     punishment_duration: Optional[str] = None
 
-# Auth helpers
-async def get_current_user(request: Request) -> Optional[User]:
-    session_token = request.cookies.get("session_token")
-    if not session_token or session_token not in sessions:
-        return None
-    
-    discord_id = sessions[session_token]
-    user_doc = await db.users.find_one({"discord_id": discord_id}, {"_id": 0})
-    if not user_doc:
-        return None
-    
-    return User(**user_doc)
+class FiveMBatchAction(BaseModel):
+    # Action-specific fields (reason, amount, item, count...) are passed through to the bridge
+    model_config = ConfigDict(extra="allow")
+    action: Literal[
+        "kick", "ban", "teleport", "heal", "revive", "armor", "freeze", "unfreeze",
+        "give-money", "set-job", "give-item", "give-weapon", "bring", "goto",
+        "spectate", "clear-inventory", "wipe-player"
+    ]
+    player_id: Union[int, str]
 
-async def require_auth(request: Request) -> User:
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+class FiveMBatchRequest(BaseModel):
+    actions: List[FiveMBatchAction] = Field(min_length=1, max_length=100)
+
+# Database indexes
+# Case-insensitive comparison for username search
+USERNAME_COLLATION = Collation(locale="en", strength=2)
+
+# Each entry: (collection, keys, options, endpoints/tasks whose queries rely on the index).
+# Names are explicit so the index report and create_index stay idempotent across deploys.
+INDEX_SPECS = [
+    ("users", [("discord_id", 1)], {"name": "discord_id_unique", "unique": True},
+     ["get_current_user", "discord_callback", "add_strike", "remove_strike", "uprank_member", "transfer_staff_member", "search_user_applications"]),
+    ("users", [("username", 1)], {"name": "username_ci", "collation": USERNAME_COLLATION},
+     ["search_user_applications"]),
+    ("users", [("is_admin", 1)], {"name": "is_admin"},
+     ["get_staff"]),
+    ("users", [("on_probation", 1), ("probation_end_date", 1)], {"name": "on_probation_end_date"},
+     ["sync_probation_jobs"]),
+    ("applications", [("id", 1)], {"name": "id_unique", "unique": True},
+     ["get_application", "review_application"]),
+    ("applications", [("user_id", 1), ("application_type_id", 1), ("status", 1)], {"name": "user_type_status"},
+     ["create_application"]),
+    ("applications", [("submitted_at", -1), ("id", -1)], {"name": "submitted_at_id"},
+     ["get_applications"]),
+    ("applications", [("user_id", 1), ("submitted_at", -1), ("id", -1)], {"name": "user_submitted_at_id"},
+     ["get_applications", "search_user_applications"]),
+    ("applications", [("status", 1), ("submitted_at", -1), ("id", -1)], {"name": "status_submitted_at_id"},
+     ["get_applications", "reconcile_stats"]),
+    ("applications", [("application_type_id", 1), ("submitted_at", -1), ("id", -1)], {"name": "type_submitted_at_id"},
+     ["get_applications"]),
+    ("application_types", [("id", 1)], {"name": "id_unique", "unique": True},
+     ["create_application", "update_application_type", "delete_application_type", "search_user_applications"]),
+    ("reports", [("id", 1)], {"name": "id_unique", "unique": True},
+     ["get_report", "update_report", "PunishmentDecisionButton"]),
+    ("reports", [("submitted_at", -1), ("id", -1)], {"name": "submitted_at_id"},
+     ["get_reports"]),
+    ("reports", [("reporter_id", 1), ("submitted_at", -1), ("id", -1)], {"name": "reporter_submitted_at_id"},
+     ["get_reports"]),
+    ("reports", [("status", 1), ("submitted_at", -1), ("id", -1)], {"name": "status_submitted_at_id"},
+     ["get_reports", "reconcile_stats"]),
+    ("reports", [("report_type", 1), ("submitted_at", -1), ("id", -1)], {"name": "report_type_submitted_at_id"},
+     ["get_reports"]),
+    ("reports", [("reported_player", 1), ("submitted_at", -1)], {"name": "reported_player_submitted_at"},
+     ["get_reports"]),
+    ("staff_notes", [("id", 1)], {"name": "id_unique", "unique": True},
+     ["migrate_user_notes"]),
+    ("staff_notes", [("discord_id", 1), ("added_at", -1), ("id", -1)], {"name": "discord_id_added_at_id"},
+     ["get_staff_notes", "get_my_team"]),
+    ("staff_notes", [("discord_id", 1), ("type", 1), ("active", 1), ("added_at", -1), ("id", -1)], {"name": "strike_ledger"},
+     ["request_firing", "remove_strike", "migrate_strike_ledger"]),
+    ("staff_teams", [("id", 1)], {"name": "id_unique", "unique": True},
+     ["review_application", "transfer_staff_member", "add_staff_member", "delete_staff_team"]),
+    ("staff_teams", [("head_admin_id", 1)], {"name": "head_admin_id"},
+     ["get_my_team", "add_strike", "add_note", "uprank_member"]),
+    ("staff_teams", [("members", 1)], {"name": "members"},
+     ["touch_member_teams"]),
+    ("firing_requests", [("id", 1)], {"name": "id_unique", "unique": True},
+     ["FiringDecisionButton"]),
+    ("punishment_approvals", [("message_id", 1)],
+     {"name": "message_id_unique", "unique": True, "partialFilterExpression": {"message_id": {"$type": "string"}}},
+     ["PunishmentDecisionButton"]),
+    ("notification_outbox", [("status", 1), ("next_attempt_at", 1)], {"name": "status_next_attempt_at"},
+     ["NotificationOutbox"]),
+    ("notification_outbox", [("coalesce_key", 1), ("status", 1)],
+     {"name": "coalesce_key_status", "partialFilterExpression": {"coalesce_key": {"$exists": True}}},
+     ["NotificationOutbox"]),
+    ("notification_outbox", [("coalesce_key", 1)],
+     {"name": "coalesce_key_pending_unique", "unique": True,
+      "partialFilterExpression": {"coalesce_key": {"$exists": True}, "status": "pending"}},
+     ["NotificationOutbox"]),
+    ("notification_outbox", [("expires_at", 1)], {"name": "expires_at_ttl", "expireAfterSeconds": 0},
+     ["NotificationOutbox"]),
+    ("notification_outbox", [("ref", 1)],
+     {"name": "ref", "partialFilterExpression": {"ref": {"$exists": True}}},
+     ["get_strike_status"]),
+    ("scheduled_jobs", [("status", 1), ("due_at", 1)], {"name": "status_due_at"},
+     ["JobScheduler"]),
+    ("scheduled_jobs", [("expires_at", 1)], {"name": "expires_at_ttl", "expireAfterSeconds": 0},
+     ["JobScheduler"]),
+]
+
+async def ensure_indexes():
+    """Create every index in INDEX_SPECS (no-op for indexes that already exist)"""
+    for collection_name, keys, options, _ in INDEX_SPECS:
+        try:
+            await db[collection_name].create_index(keys, **options)
+        except Exception as e:
+            # e.g. duplicate values blocking a unique index - keep starting up, report it
+            print(f"❌ Failed to create index {collection_name}.{options['name']}: {e}")
+    print(f"✅ Ensured {len(INDEX_SPECS)} database indexes")
+
+async def get_index_report() -> dict:
+    """Map each endpoint to the indexes it relies on and whether they exist"""
+    existing = {}
+    for collection_name in {spec[0] for spec in INDEX_SPECS}:
+        existing[collection_name] = set((await db[collection_name].index_information()).keys())
+
+    report = {}
+    for collection_name, keys, options, used_by in INDEX_SPECS:
+        index_info = {
+            "collection": collection_name,
+            "name": options["name"],
+            "keys": [key for key, _ in keys],
+            "unique": options.get("unique", False),
+            "exists": options["name"] in existing[collection_name]
+        }
+        for endpoint in used_by:
+            report.setdefault(endpoint, []).append(index_info)
+    return report
+
+# Dashboard stats counters
+# Kept in a single `stats` document: the write paths $inc it and a periodic job recounts
+# everything, so GET /stats is one find_one regardless of collection size.
+STATS_DOC_ID = "dashboard"
+STATS_RECONCILE_INTERVAL_SECONDS = int(os.environ.get('STATS_RECONCILE_INTERVAL_SECONDS', '600'))
+
+async def bump_stats(increments: dict):
+    """Apply counter deltas, e.g. {"applications_by_status.pending": 1}"""
+    try:
+        # No upsert: until the first reconcile there is nothing correct to increment
+        await db.stats.update_one({"_id": STATS_DOC_ID}, {"$inc": increments})
+    except Exception as e:
+        # The next reconcile corrects the drift
+        print(f"Failed to update stats counters: {e}")
+
+async def count_by_status(collection) -> dict:
+    counts = await collection.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]).to_list(None)
+    return {entry["_id"]: entry["count"] for entry in counts if entry["_id"]}
+
+async def reconcile_stats() -> dict:
+    """Recount every counter from the collections and overwrite the stats document"""
+    stats = {
+        "total_users": await db.users.estimated_document_count(),
+        "total_application_types": await db.application_types.count_documents({"active": True}),
+        "applications_by_status": await count_by_status(db.applications),
+        "reports_by_status": await count_by_status(db.reports),
+        "reconciled_at": datetime.now(timezone.utc).isoformat()
+    }
+    await db.stats.replace_one({"_id": STATS_DOC_ID}, {"_id": STATS_DOC_ID, **stats}, upsert=True)
+    return stats
+
+async def reconcile_stats_periodically():
+    """Background task correcting any drift in the stats counters"""
+    while True:
+        try:
+            await reconcile_stats()
+        except Exception as e:
+            print(f"Error reconciling stats: {e}")
+        await asyncio.sleep(STATS_RECONCILE_INTERVAL_SECONDS)
+
+# Auth helpers
+async def get_current_user(request: Request) -> Optional[User]:
+    # Resolve once per request, even when several dependencies ask for the user
+    if hasattr(request.state, "current_user"):
+        return request.state.current_user
+    
+    user = None
+    session_token = request.cookies.get("session_token")
+    discord_id = await session_store.get(session_token) if session_token else None
+    if discord_id:
+        user = user_cache.get(discord_id)
+        if not user:
+            user_doc = await db.users.find_one({"discord_id": discord_id}, {"_id": 0})
+            if user_doc:
+                user = User(**user_doc)
+                user_cache.put(discord_id, user)
+    
+    request.state.current_user = user
+    return user
+
+async def require_auth(request: Request) -> User:
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
     return user
 
 async def require_admin(request: Request) -> User:
@@ -1294,6 +2015,7 @@ async def discord_callback(code: str, response: Response):
                 role=role_type
             )
             await db.users.insert_one(user_obj.model_dump())
+            await bump_stats({"total_users": 1})
         else:
             # Always update ALL role-related fields to ensure demotions work
             update_data = {
@@ -1312,10 +2034,11 @@ async def discord_callback(code: str, response: Response):
                 {"discord_id": discord_id},
                 {"$set": update_data}
             )
+        await invalidate_user_cache(discord_id)
         
         # Create session
         session_token = secrets.token_urlsafe(32)
-        sessions[session_token] = discord_id
+        await session_store.set(session_token, discord_id)
         
         # Create redirect response and set cookie on it
         redirect_response = RedirectResponse(url="https://www.redicate.dk")
@@ -1325,7 +2048,7 @@ async def discord_callback(code: str, response: Response):
             domain=".redicate.dk",
             httponly=True,
             secure=True,
-            max_age=7 * 24 * 60 * 60,
+            max_age=SESSION_TTL_SECONDS,
             samesite="none"
         )
         
@@ -1338,8 +2061,8 @@ async def get_current_user_info(user: User = Depends(require_auth)):
 @api_router.post("/auth/logout")
 async def logout(request: Request, response: Response):
     session_token = request.cookies.get("session_token")
-    if session_token and session_token in sessions:
-        del sessions[session_token]
+    if session_token:
+        await session_store.delete(session_token)
     response.delete_cookie("session_token")
     return {"success": True}
 
@@ -1353,6 +2076,7 @@ async def get_application_types():
 async def create_application_type(app_type_data: ApplicationTypeCreate, user: User = Depends(require_admin)):
     app_type = ApplicationType(**app_type_data.model_dump(), created_by=user.discord_id)
     await db.application_types.insert_one(app_type.model_dump())
+    await bump_stats({"total_application_types": 1})
     return app_type
 
 @api_router.put("/application-types/{type_id}", response_model=ApplicationType)
@@ -1369,23 +2093,112 @@ async def update_application_type(type_id: str, app_type_data: ApplicationTypeCr
 
 @api_router.delete("/application-types/{type_id}")
 async def delete_application_type(type_id: str, user: User = Depends(require_admin)):
-    result = await db.application_types.update_one(
+    previous = await db.application_types.find_one_and_update(
         {"id": type_id},
-        {"$set": {"active": False}}
+        {"$set": {"active": False}},
+        projection={"_id": 0, "active": 1}
     )
-    if result.matched_count == 0:
+    if not previous:
         raise HTTPException(status_code=404, detail="Application type not found")
+    if previous.get("active", True):
+        await bump_stats({"total_application_types": -1})
     return {"success": True}
 
+# Pagination helpers
+# Keyset pagination, newest first, on (<sort_field>, id). The next-page cursor and the
+# total-count estimate are returned in headers so list responses stay plain arrays.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    payload = json.dumps([doc[sort_field], doc["id"]]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        sort_value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(sort_value), str(last_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_date_filter(value: Optional[str], param: str) -> Optional[str]:
+    """Normalize an ISO date/datetime query param to the UTC isoformat stored in the database"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {param}, expected ISO date")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+def is_date_only(value: str) -> bool:
+    """True for a plain YYYY-MM-DD value (no time part)"""
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return len(value) == 10
+
+async def fetch_page(collection, query: dict, projection: dict, sort_field: str, cursor: Optional[str], limit: int, response: Response) -> List[dict]:
+    """Fetch one page of `collection` and set the X-Next-Cursor / X-Total-Count headers"""
+    page_query = query
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        after_cursor = {"$or": [
+            {sort_field: {"$lt": sort_value}},
+            {sort_field: sort_value, "id": {"$lt": last_id}}
+        ]}
+        page_query = {"$and": [query, after_cursor]} if query else after_cursor
+
+    # Fetch one extra document to know whether there is a next page
+    docs = await collection.find(page_query, projection).sort(
+        [(sort_field, -1), ("id", -1)]
+    ).limit(limit + 1).to_list(limit + 1)
+
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1], sort_field)
+
+    # Only count on the first page; clients keep the estimate while paging
+    if not cursor:
+        if query:
+            total = await collection.count_documents(query)
+        else:
+            total = await collection.estimated_document_count()
+        response.headers["X-Total-Count"] = str(total)
+
+    return docs
+
 # Applications endpoints
-@api_router.get("/applications", response_model=List[Application])
-async def get_applications(user: User = Depends(require_auth)):
-    if user.is_admin:
-        applications = await db.applications.find({}, {"_id": 0}).to_list(1000)
-    else:
-        applications = await db.applications.find({"user_id": user.discord_id}, {"_id": 0}).to_list(1000)
+@api_router.get("/applications", response_model=List[Union[Application, ApplicationSummary]])
+async def get_applications(
+    response: Response,
+    user: User = Depends(require_auth),
+    status: Optional[Literal["pending", "approved", "rejected"]] = None,
+    application_type_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """List applications newest first, paginated with the X-Next-Cursor header.
+
+    view=summary leaves out the answers; fetch GET /applications/{app_id} for the details.
+    """
+    query = {}
+    if not user.is_admin:
+        query["user_id"] = user.discord_id
+    elif user_id:
+        query["user_id"] = user_id
+    if status:
+        query["status"] = status
+    if application_type_id:
+        query["application_type_id"] = application_type_id
     
-    return applications
+    projection = APPLICATION_SUMMARY_PROJECTION if view == "summary" else {"_id": 0}
+    return await fetch_page(db.applications, query, projection, "submitted_at", cursor, limit, response)
 
 @api_router.post("/applications", response_model=Application)
 async def create_application(app_data: ApplicationCreate, user: User = Depends(require_auth)):
@@ -1412,8 +2225,12 @@ async def create_application(app_data: ApplicationCreate, user: User = Depends(r
     )
     
     await db.applications.insert_one(application.model_dump())
+    await bump_stats({"applications_by_status.pending": 1})
     return application
 
+# Newest applications returned per matched user ($topN needs MongoDB 5.2+)
+SEARCH_APPLICATIONS_PER_USER = 100
+
 @api_router.get("/applications/search")
 async def search_user_applications(username: str = None, discord_id: str = None, user: User = Depends(require_admin)):
     """Search for a user and get all their applications"""
@@ -1422,38 +2239,62 @@ async def search_user_applications(username: str = None, discord_id: str = None,
     
     # Find user
     query = {}
+    find_options = {}
     if discord_id:
         query["discord_id"] = discord_id
     elif username:
-        query["username"] = {"$regex": username, "$options": "i"}
+        # Case-insensitive prefix match, served by the username_ci collation index
+        query["username"] = {"$gte": username, "$lt": username + "\uffff"}
+        find_options["collation"] = USERNAME_COLLATION
     
     # Get all users matching search
-    users = await db.users.find(query, {"_id": 0, "discord_id": 1, "username": 1, "avatar": 1, "role": 1}).to_list(10)
+    users = await db.users.find(
+        query,
+        {"_id": 0, "discord_id": 1, "username": 1, "avatar": 1, "role": 1},
+        **find_options
+    ).to_list(10)
     
     if not users:
         return {"users": [], "message": "Ingen brugere fundet"}
     
-    # For each user, get their applications
-    results = []
-    for user_data in users:
-        applications = await db.applications.find(
-            {"user_id": user_data["discord_id"]},
-            {"_id": 0}
-        ).sort("submitted_at", -1).to_list(100)
-        
-        # Get application type details for each application
-        for app in applications:
-            app_type = await db.application_types.find_one(
-                {"id": app["application_type_id"]},
-                {"_id": 0, "name": 1, "questions": 1}
-            )
+    # Fetch the newest applications of every matched user in one query, capped per user
+    user_ids = [user_data["discord_id"] for user_data in users]
+    grouped = await db.applications.aggregate([
+        {"$match": {"user_id": {"$in": user_ids}}},
+        {"$project": {"_id": 0}},
+        {"$group": {
+            "_id": "$user_id",
+            "applications": {"$topN": {
+                "n": SEARCH_APPLICATIONS_PER_USER,
+                "sortBy": {"submitted_at": -1, "id": -1},
+                "output": "$$ROOT"
+            }}
+        }}
+    ]).to_list(None)
+    applications_by_user = {user_id: [] for user_id in user_ids}
+    applications_by_user.update({group["_id"]: group["applications"] for group in grouped})
+    
+    # ...and the application types they reference in another
+    type_ids = list({app["application_type_id"] for group in grouped for app in group["applications"]})
+    app_types = await db.application_types.find(
+        {"id": {"$in": type_ids}},
+        {"_id": 0, "id": 1, "name": 1, "questions": 1}
+    ).to_list(None)
+    app_types_by_id = {app_type.pop("id"): app_type for app_type in app_types}
+    
+    for user_applications in applications_by_user.values():
+        for app in user_applications:
+            app_type = app_types_by_id.get(app["application_type_id"])
             if app_type:
                 app["application_type_details"] = app_type
-        
+    
+    results = []
+    for user_data in users:
+        user_applications = applications_by_user[user_data["discord_id"]]
         results.append({
             "user": user_data,
-            "applications": applications,
-            "total_applications": len(applications)
+            "applications": user_applications,
+            "total_applications": len(user_applications)
         })
     
     return {"users": results, "total_users": len(results)}
@@ -1473,7 +2314,6 @@ async def get_application(app_id: str, user: User = Depends(require_auth)):
 async def review_application(
     app_id: str, 
     review: ApplicationReview, 
-    background_tasks: BackgroundTasks,
     user: User = Depends(require_admin),
     team_id: Optional[str] = None
 ):
@@ -1481,15 +2321,21 @@ async def review_application(
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    # Update application status
-    await db.applications.update_one(
+    # Update application status (the pre-image tells us which counter to move)
+    previous = await db.applications.find_one_and_update(
         {"id": app_id},
         {"$set": {
             "status": review.status,
             "reviewed_by": user.username,
             "reviewed_at": datetime.now(timezone.utc).isoformat()
-        }}
+        }},
+        projection={"_id": 0, "status": 1}
     )
+    if previous and previous.get("status") != review.status:
+        await bump_stats({
+            f"applications_by_status.{previous.get('status', 'pending')}": -1,
+            f"applications_by_status.{review.status}": 1
+        })
     
     # Initialize assigned_team
     assigned_team = None
@@ -1520,7 +2366,6 @@ async def review_application(
                 "role": "staff_member",
                 "staff_rank": "mod_elev",
                 "strikes": 0,
-                "notes": [],
                 "team_id": assigned_team["id"] if assigned_team else None,
                 "is_admin": False,
                 "is_head_admin": False,
@@ -1528,29 +2373,29 @@ async def review_application(
                 "probation_end_date": probation_end.isoformat()
             }}
         )
+        await invalidate_user_cache(application["user_id"])
+        await schedule_probation_end(application["user_id"], probation_end)
         
         # Add Discord probation role (not perm staff yet)
-        background_tasks.add_task(
-            give_probation_role,
-            application["user_id"]
-        )
+        await notification_outbox.enqueue("probation_role", f"roles:{application['user_id']}", {
+            "discord_id": application["user_id"]
+        })
         
         # If team assigned, add to team and notify head admin
         if assigned_team:
             # Add member to team
             await db.staff_teams.update_one(
                 {"id": assigned_team["id"]},
-                {"$addToSet": {"members": application["user_id"]}}
+                {"$addToSet": {"members": application["user_id"]}, "$inc": {"version": 1}}
             )
             
             # Send guide to head admin via Discord DM
-            background_tasks.add_task(
-                send_staff_assignment_dm,
-                assigned_team["head_admin_id"],
-                application["username"],
-                application["user_id"],
-                assigned_team["name"]
-            )
+            await notification_outbox.enqueue("staff_assignment", f"dm:{assigned_team['head_admin_id']}", {
+                "head_admin_id": assigned_team["head_admin_id"],
+                "new_staff_username": application["username"],
+                "new_staff_id": application["user_id"],
+                "team_name": assigned_team["name"]
+            })
     
     # Send Discord embed in background with team info if staff application
     head_admin_id = None
@@ -1559,28 +2404,60 @@ async def review_application(
         head_admin_id = assigned_team["head_admin_id"]
         team_name = assigned_team["name"]
     
-    background_tasks.add_task(
-        send_discord_embed,
-        application["user_id"],
-        application["username"],
-        application["application_type_name"],
-        review.status,
-        user.username,
-        head_admin_id,
-        team_name
-    )
+    await notification_outbox.enqueue("application_review", f"channel:{DISCORD_CHANNEL_ID}", {
+        "user_id": application["user_id"],
+        "username": application["username"],
+        "app_type": application["application_type_name"],
+        "status": review.status,
+        "reviewed_by": user.username,
+        "head_admin_id": head_admin_id,
+        "team_name": team_name
+    })
     
     return {"success": True}
 
 # Report endpoints
-@api_router.get("/reports", response_model=List[Report])
-async def get_reports(user: User = Depends(require_auth)):
-    if user.is_admin:
-        reports = await db.reports.find({}, {"_id": 0}).to_list(1000)
-    else:
-        reports = await db.reports.find({"reporter_id": user.discord_id}, {"_id": 0}).to_list(1000)
+@api_router.get("/reports", response_model=List[Union[Report, ReportSummary]])
+async def get_reports(
+    response: Response,
+    user: User = Depends(require_auth),
+    status: Optional[Literal["pending", "investigating", "resolved", "dismissed"]] = None,
+    report_type: Optional[str] = None,
+    reported_player: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """List reports newest first, paginated with the X-Next-Cursor header"""
+    query = {}
+    if not user.is_admin:
+        query["reporter_id"] = user.discord_id
+    if status:
+        query["status"] = status
+    if report_type:
+        query["report_type"] = report_type
+    if reported_player:
+        # Anchored prefix match so the reported_player index can be used
+        query["reported_player"] = {"$regex": f"^{re.escape(reported_player)}"}
     
-    return reports
+    submitted_range = {}
+    if date_from:
+        submitted_range["$gte"] = parse_date_filter(date_from, "date_from")
+    if date_to:
+        if is_date_only(date_to):
+            # A plain date includes that whole day
+            submitted_range["$lt"] = parse_date_filter(
+                (date.fromisoformat(date_to) + timedelta(days=1)).isoformat(), "date_to"
+            )
+        else:
+            submitted_range["$lte"] = parse_date_filter(date_to, "date_to")
+    if submitted_range:
+        query["submitted_at"] = submitted_range
+    
+    projection = REPORT_SUMMARY_PROJECTION if view == "summary" else {"_id": 0}
+    return await fetch_page(db.reports, query, projection, "submitted_at", cursor, limit, response)
 
 @api_router.post("/reports", response_model=Report)
 async def create_report(report_data: ReportCreate, user: User = Depends(require_auth)):
@@ -1594,6 +2471,7 @@ async def create_report(report_data: ReportCreate, user: User = Depends(require_
     )
     
     await db.reports.insert_one(report.model_dump())
+    await bump_stats({"reports_by_status.pending": 1})
     return report
 
 @api_router.get("/reports/{report_id}", response_model=Report)
@@ -1626,42 +2504,44 @@ async def update_report(report_id: str, update: ReportUpdate, user: User = Depen
         update_data["punishment_type"] = update.punishment_type
         update_data["punishment_duration"] = update.punishment_duration
     
-    await db.reports.update_one(
+    previous = await db.reports.find_one_and_update(
         {"id": report_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"_id": 0, "status": 1}
     )
+    if previous and previous.get("status") != update.status:
+        await bump_stats({
+            f"reports_by_status.{previous.get('status', 'pending')}": -1,
+            f"reports_by_status.{update.status}": 1
+        })
     
     # Send punishment to punishment channel if punishment was given
     if update.punishment_type and update.punishment_type != "none":
-        asyncio.create_task(
-            send_punishment_to_channel(
-                report_id,
-                report["reported_player"],
-                report["report_type"],
-                update.punishment_type,
-                update.punishment_duration,
-                user.username,
-                report["description"],
-                report.get("evidence"),
-                report["reporter_id"]  # Include reporter_id for notifications
-            )
-        )
+        await notification_outbox.enqueue("punishment_proposal", f"channel:{DISCORD_PUNISHMENT_CHANNEL_ID}", {
+            "report_id": report_id,
+            "reported_player": report["reported_player"],
+            "report_type": report["report_type"],
+            "punishment_type": update.punishment_type,
+            "punishment_duration": update.punishment_duration,
+            "handled_by": user.username,
+            "description": report["description"],
+            "evidence": report.get("evidence"),
+            "reporter_id": report["reporter_id"]  # Include reporter_id for notifications
+        })
     
-    # Send DM notification to reporter about ALL changes
-    asyncio.create_task(
-        send_report_status_notification(
-            report["reporter_id"],
-            report["reporter_username"],
-            report_id,
-            report["reported_player"],
-            report["report_type"],
-            update.status,
-            user.username,
-            update.admin_notes,
-            update.punishment_type,
-            update.punishment_duration
-        )
-    )
+    # Send DM notification to reporter about ALL changes (quick successive edits are merged)
+    await notification_outbox.enqueue("report_status", f"dm:{report['reporter_id']}", {
+        "reporter_id": report["reporter_id"],
+        "reporter_username": report["reporter_username"],
+        "report_id": report_id,
+        "reported_player": report["reported_player"],
+        "report_type": report["report_type"],
+        "new_status": update.status,
+        "handled_by": user.username,
+        "admin_notes": update.admin_notes,
+        "punishment_type": update.punishment_type,
+        "punishment_duration": update.punishment_duration
+    }, coalesce_key=f"report_status:{report_id}")
     
     return {"success": True}
 
@@ -1671,20 +2551,43 @@ async def get_staff_teams(user: User = Depends(require_admin)):
     teams = await db.staff_teams.find({}, {"_id": 0}).to_list(1000)
     return teams
 
+# Only what the team panel's member cards need; notes are loaded per member from GET /staff/members/{discord_id}/notes
+TEAM_MEMBER_PROJECTION = {
+    "_id": 0, "discord_id": 1, "username": 1, "avatar": 1, "staff_rank": 1,
+    "strikes": 1, "on_probation": 1, "probation_end_date": 1
+}
+
 @api_router.get("/staff/my-team")
-async def get_my_team(user: User = Depends(require_head_admin)):
-    """Get the team where current user is head admin"""
+async def get_my_team(request: Request, response: Response, user: User = Depends(require_head_admin)):
+    """Get the team where current user is head admin.
+
+    The ETag is the team's version, so a refresh with nothing changed gets a bodyless 304.
+    """
     team = await db.staff_teams.find_one({"head_admin_id": user.discord_id}, {"_id": 0})
     if not team:
         raise HTTPException(status_code=404, detail="No team found for this head admin")
     
+    etag = f'W/"{team["id"]}.{team.get("version", 0)}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+    
     # Get team member details
     members = []
     if team.get("members"):
         members = await db.users.find(
             {"discord_id": {"$in": team["members"]}},
-            {"_id": 0}
-        ).to_list(1000)
+            TEAM_MEMBER_PROJECTION
+        ).to_list(len(team["members"]))
+        
+        note_counts = await db.staff_notes.aggregate([
+            {"$match": {"discord_id": {"$in": team["members"]}}},
+            {"$group": {"_id": "$discord_id", "count": {"$sum": 1}}}
+        ]).to_list(None)
+        note_counts = {entry["_id"]: entry["count"] for entry in note_counts}
+        for member in members:
+            member["notes_count"] = note_counts.get(member["discord_id"], 0)
     
     return {
         "team": team,
@@ -1700,6 +2603,87 @@ async def remove_my_team_member(discord_id: str, user: User = Depends(require_he
     )
 
 # Staff Management Endpoints (Strikes, Notes, Uprank)
+# Notes live in `staff_notes`, one typed document per entry, so user documents stay fixed-size.
+async def add_staff_note(discord_id: str, note_type: str, text: str, added_by: str, **details) -> dict:
+    """Insert a note about a staff member; `details` are the type-specific StaffNote fields"""
+    note = StaffNote(discord_id=discord_id, type=note_type, text=text, added_by=added_by, **details)
+    doc = note.model_dump(exclude_none=True)
+    await db.staff_notes.insert_one(doc)
+    doc.pop("_id", None)
+    await touch_member_teams(discord_id)  # notes_count changed
+    return doc
+
+# Strike ledger: every strike is a "strike" note with an `active` flag that remove_strike clears.
+# users.strikes is the precomputed number of active strikes; both are kept in step below.
+async def record_strike(discord_id: str, reason: str, added_by: str) -> dict:
+    """Count a new strike and add it to the ledger. Returns the user's username, new strike count and the entry.
+
+    The count is changed with a single $inc and the strike number comes from the pre-image;
+    if the ledger entry can't be written the increment is undone.
+    """
+    previous = await db.users.find_one_and_update(
+        {"discord_id": discord_id},
+        {"$inc": {"strikes": 1}},
+        projection={"_id": 0, "username": 1, "strikes": 1}
+    )
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Staff member not found")
+    
+    new_strikes = previous.get("strikes", 0) + 1
+    try:
+        await invalidate_user_cache(discord_id)
+        strike = await add_staff_note(
+            discord_id, "strike", f"⚠️ Strike {new_strikes}/3: {reason}", added_by,
+            strike_number=new_strikes, reason=reason, active=True
+        )
+    except Exception:
+        await db.users.update_one({"discord_id": discord_id}, {"$inc": {"strikes": -1}})
+        await invalidate_user_cache(discord_id)
+        raise
+    return {"username": previous["username"], "strikes": new_strikes, "strike": strike}
+
+async def revoke_strike(discord_id: str, removed_by: str) -> dict:
+    """Lower the count, mark the newest active strike as removed and note it. Returns the new strike count.
+
+    Like record_strike, the count is changed first and every step is undone if a later one fails.
+    """
+    previous = await db.users.find_one_and_update(
+        {"discord_id": discord_id, "strikes": {"$gte": 1}},
+        {"$inc": {"strikes": -1}},
+        projection={"_id": 0, "strikes": 1}
+    )
+    if previous is None:
+        if await db.users.find_one({"discord_id": discord_id}, {"_id": 1}) is None:
+            raise HTTPException(status_code=404, detail="Staff member not found")
+        raise HTTPException(status_code=400, detail="Staff member has no strikes to remove")
+    
+    old_strikes = previous["strikes"]
+    new_strikes = old_strikes - 1
+    strike = None
+    try:
+        await invalidate_user_cache(discord_id)
+        # Strikes given before the ledger existed may have no entry; the count is still lowered
+        strike = await db.staff_notes.find_one_and_update(
+            {"discord_id": discord_id, "type": "strike", "active": True},
+            {"$set": {"active": False, "removed_at": datetime.now(timezone.utc).isoformat(), "removed_by": removed_by}},
+            sort=[("added_at", -1), ("id", -1)],
+            projection={"id": 1}
+        )
+        await add_staff_note(
+            discord_id, "strike_removed", f"✅ Strike fjernet af Super Admin (strikes: {old_strikes} → {new_strikes})", removed_by,
+            strike_number=new_strikes, strike_id=strike["id"] if strike else None
+        )
+    except Exception:
+        if strike is not None:
+            await db.staff_notes.update_one(
+                {"id": strike["id"]},
+                {"$set": {"active": True}, "$unset": {"removed_at": "", "removed_by": ""}}
+            )
+        await db.users.update_one({"discord_id": discord_id}, {"$inc": {"strikes": 1}})
+        await invalidate_user_cache(discord_id)
+        raise
+    return {"strikes": new_strikes}
+
 @api_router.post("/staff/my-team/members/{discord_id}/strike")
 async def add_strike(discord_id: str, strike_data: AddStrikeRequest, user: User = Depends(require_head_admin)):
     """Add a strike to a team member"""
@@ -1708,61 +2692,49 @@ async def add_strike(discord_id: str, strike_data: AddStrikeRequest, user: User
     if not team or discord_id not in team.get("members", []):
         raise HTTPException(status_code=404, detail="Member not in your team")
     
-    # Get staff member
-    staff = await db.users.find_one({"discord_id": discord_id})
-    if not staff:
-        raise HTTPException(status_code=404, detail="Staff member not found")
-    
-    new_strikes = staff.get("strikes", 0) + 1
+    # Update strikes and add note about strike
+    staff = await record_strike(discord_id, strike_data.reason, user.username)
+    new_strikes = staff["strikes"]
     
-    # Update strikes
-    await db.users.update_one(
-        {"discord_id": discord_id},
-        {"$set": {"strikes": new_strikes}}
-    )
-    
-    # Add note about strike
-    note = {
-        "text": f"⚠️ Strike {new_strikes}/3: {strike_data.reason}",
-        "added_by": user.username,
-        "added_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.users.update_one(
-        {"discord_id": discord_id},
-        {"$push": {"notes": note}}
-    )
+    # Discord side effects run in the background; their progress is at GET /staff/strikes/{strike_id}/status
+    strike_id = staff["strike"]["id"]
     
     # Send DM notification to staff member about the strike
-    await send_strike_notification_dm(
-        discord_id,
-        staff["username"],
-        new_strikes,
-        strike_data.reason,
-        user.username
-    )
+    await notification_outbox.enqueue("strike", f"dm:{discord_id}", {
+        "staff_discord_id": discord_id,
+        "staff_username": staff["username"],
+        "strike_number": new_strikes,
+        "reason": strike_data.reason,
+        "added_by": user.username
+    }, ref=f"strike:{strike_id}")
     
     # If 3 strikes, notify for firing
     if new_strikes >= 3:
-        # Get all strikes for this staff member
-        updated_staff = await db.users.find_one({"discord_id": discord_id}, {"_id": 0})
-        strikes_list = []
-        for note in updated_staff.get("notes", []):
-            if "Strike" in note.get("text", ""):
-                strikes_list.append({
-                    "reason": note["text"],
-                    "added_by": note["added_by"],
-                    "added_at": note["added_at"]
-                })
-        
-        await notify_firing_request(
-            staff["username"],
-            discord_id,
-            user.username,
-            user.discord_id,
-            strikes_list
-        )
+        await notification_outbox.enqueue("firing_request", f"channel:{DISCORD_FIRING_CHANNEL_ID}", {
+            "staff_id": discord_id,
+            "staff_username": staff["username"],
+            "head_admin_id": user.discord_id,
+            "head_admin_username": user.username,
+            "request_id": strike_id
+        }, ref=f"strike:{strike_id}")
     
-    return {"success": True, "strikes": new_strikes, "requires_firing": new_strikes >= 3}
+    return {"success": True, "strikes": new_strikes, "requires_firing": new_strikes >= 3, "strike_id": strike_id}
+
+@api_router.get("/staff/strikes/{strike_id}/status")
+async def get_strike_status(strike_id: str, user: User = Depends(require_head_admin)):
+    """Delivery status of a strike's DM and (at 3 strikes) firing request"""
+    jobs = await notification_outbox.status(f"strike:{strike_id}")
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Strike not found")
+    
+    firing_request = None
+    if "firing_request" in jobs:
+        firing_request = await db.firing_requests.find_one({"id": strike_id}, {"_id": 0, "status": 1, "discord_message_id": 1})
+    return {
+        "strike_id": strike_id,
+        "dm": jobs.get("strike"),
+        "firing_request": {**jobs["firing_request"], "request": firing_request} if "firing_request" in jobs else None
+    }
 
 @api_router.post("/staff/my-team/members/{discord_id}/note")
 async def add_note(discord_id: str, note_data: AddNoteRequest, user: User = Depends(require_head_admin)):
@@ -1772,52 +2744,37 @@ async def add_note(discord_id: str, note_data: AddNoteRequest, user: User = Depe
     if not team or discord_id not in team.get("members", []):
         raise HTTPException(status_code=404, detail="Member not in your team")
     
-    note = {
-        "text": note_data.note,
-        "added_by": user.username,
-        "added_at": datetime.now(timezone.utc).isoformat()
-    }
+    note = await add_staff_note(discord_id, "note", note_data.note, user.username)
     
-    await db.users.update_one(
-        {"discord_id": discord_id},
-        {"$push": {"notes": note}}
-    )
+    return {"success": True, "note": note}
+
+@api_router.get("/staff/members/{discord_id}/notes", response_model=List[StaffNote])
+async def get_staff_notes(
+    discord_id: str,
+    response: Response,
+    user: User = Depends(require_auth),
+    note_type: Optional[Literal["strike", "note", "uprank", "strike_removed"]] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Notes about a staff member, newest first (their head admin or a super admin)"""
+    if user.role != "super_admin":
+        team = await db.staff_teams.find_one({"head_admin_id": user.discord_id}, {"_id": 0, "members": 1})
+        if not team or discord_id not in team.get("members", []):
+            raise HTTPException(status_code=404, detail="Member not in your team")
     
-    return {"success": True}
+    query = {"discord_id": discord_id}
+    if note_type:
+        query["type"] = note_type
+    return await fetch_page(db.staff_notes, query, {"_id": 0}, "added_at", cursor, limit, response)
 
 @api_router.post("/super-admin/strikes/remove/{discord_id}")
 async def remove_strike(discord_id: str, user: User = Depends(require_super_admin)):
     """Remove a strike from a staff member (Super Admin only)"""
-    # Get staff member
-    staff = await db.users.find_one({"discord_id": discord_id})
-    if not staff:
-        raise HTTPException(status_code=404, detail="Staff member not found")
-    
-    current_strikes = staff.get("strikes", 0)
-    
-    if current_strikes <= 0:
-        raise HTTPException(status_code=400, detail="Staff member has no strikes to remove")
-    
-    new_strikes = current_strikes - 1
-    
-    # Update strikes count
-    await db.users.update_one(
-        {"discord_id": discord_id},
-        {"$set": {"strikes": new_strikes}}
-    )
+    # Clear the newest active strike, update strikes count and add note about strike removal
+    staff = await revoke_strike(discord_id, user.username)
     
-    # Add note about strike removal
-    note = {
-        "text": f"✅ Strike fjernet af Super Admin (strikes: {current_strikes} → {new_strikes})",
-        "added_by": user.username,
-        "added_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.users.update_one(
-        {"discord_id": discord_id},
-        {"$push": {"notes": note}}
-    )
-    
-    return {"success": True, "new_strikes": new_strikes}
+    return {"success": True, "new_strikes": staff["strikes"]}
 
 @api_router.post("/staff/my-team/members/{discord_id}/uprank")
 async def uprank_member(discord_id: str, uprank_data: UpRankRequest, user: User = Depends(require_head_admin)):
@@ -1831,7 +2788,7 @@ async def uprank_member(discord_id: str, uprank_data: UpRankRequest, user: User
     if not staff:
         raise HTTPException(status_code=404, detail="Staff member not found")
     
-    old_rank = staff.get("staff_rank", "mod_elev")
+    old_rank = staff.get("staff_rank") or "mod_elev"
     new_rank = uprank_data.new_rank
     
     # Update database
@@ -1840,21 +2797,24 @@ async def uprank_member(discord_id: str, uprank_data: UpRankRequest, user: User
         {"$set": {"staff_rank": new_rank}}
     )
     
+    await invalidate_user_cache(discord_id)
+    
     # Add note about uprank
-    note = {
-        "text": f"🎉 Upranket fra {old_rank} til {new_rank}",
-        "added_by": user.username,
-        "added_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.users.update_one(
-        {"discord_id": discord_id},
-        {"$push": {"notes": note}}
+    await add_staff_note(
+        discord_id, "uprank", f"🎉 Upranket fra {old_rank} til {new_rank}", user.username,
+        old_rank=old_rank, new_rank=new_rank
     )
     
-    # Update Discord roles
-    success = await update_discord_roles(discord_id, new_rank)
+    # Update Discord roles right away if this worker runs the bot, otherwise leave it to the leader
+    if discord_bot_client and discord_bot_ready:
+        success = await update_discord_roles(discord_id, new_rank)
+        return {"success": True, "discord_updated": success, "new_rank": new_rank}
     
-    return {"success": True, "discord_updated": success, "new_rank": new_rank}
+    await notification_outbox.enqueue("staff_rank", f"roles:{discord_id}", {
+        "discord_id": discord_id,
+        "new_rank": new_rank
+    })
+    return {"success": True, "discord_updated": False, "discord_queued": True, "new_rank": new_rank}
 
 @api_router.post("/staff-teams", response_model=StaffTeam)
 async def create_staff_team(team_data: StaffTeamCreate, user: User = Depends(require_admin)):
@@ -1878,12 +2838,13 @@ async def delete_staff_team(team_id: str, user: User = Depends(require_admin)):
 async def remove_staff_member(team_id: str, discord_id: str, user: User = Depends(require_admin)):
     await db.staff_teams.update_one(
         {"id": team_id},
-        {"$pull": {"members": discord_id}}
+        {"$pull": {"members": discord_id}, "$inc": {"version": 1}}
     )
     await db.users.update_one(
         {"discord_id": discord_id},
         {"$set": {"team_id": None}}
     )
+    await invalidate_user_cache(discord_id)
     return {"success": True}
 
 async def send_transfer_notifications(staff_discord_id: str, staff_username: str, old_head_admin_id: str, old_team_name: str, new_head_admin_id: str, new_team_name: str, transferred_by: str):
@@ -1894,7 +2855,7 @@ async def send_transfer_notifications(staff_discord_id: str, staff_username: str
     
     try:
         # Notify the transferred staff member
-        staff_user = await discord_bot_client.fetch_user(int(staff_discord_id))
+        staff_user = await discord_entities.get_dm_channel(int(staff_discord_id))
         if staff_user:
             embed = discord.Embed(
                 title="📋 Du er blevet overført til et nyt team!",
@@ -1916,7 +2877,7 @@ async def send_transfer_notifications(staff_discord_id: str, staff_username: str
         
         # Notify old head admin (if exists)
         if old_head_admin_id:
-            old_head_admin = await discord_bot_client.fetch_user(int(old_head_admin_id))
+            old_head_admin = await discord_entities.get_dm_channel(int(old_head_admin_id))
             if old_head_admin:
                 embed = discord.Embed(
                     title="📤 Staff medlem overført fra dit team",
@@ -1931,7 +2892,7 @@ async def send_transfer_notifications(staff_discord_id: str, staff_username: str
                 await old_head_admin.send(embed=embed)
         
         # Notify new head admin
-        new_head_admin = await discord_bot_client.fetch_user(int(new_head_admin_id))
+        new_head_admin = await discord_entities.get_dm_channel(int(new_head_admin_id))
         if new_head_admin:
             embed = discord.Embed(
                 title="📥 Nyt staff medlem overført til dit team!",
@@ -1953,6 +2914,7 @@ async def send_transfer_notifications(staff_discord_id: str, staff_username: str
         print(f"Sent transfer notifications for {staff_username}")
     except Exception as e:
         print(f"Failed to send transfer notifications: {e}")
+        raise
 
 @api_router.post("/super-admin/staff/transfer")
 async def transfer_staff_member(data: dict, user: User = Depends(require_admin)):
@@ -1976,13 +2938,13 @@ async def transfer_staff_member(data: dict, user: User = Depends(require_admin))
     if old_team_id:
         await db.staff_teams.update_one(
             {"id": old_team_id},
-            {"$pull": {"members": discord_id}}
+            {"$pull": {"members": discord_id}, "$inc": {"version": 1}}
         )
     
     # Add to new team
     await db.staff_teams.update_one(
         {"id": new_team_id},
-        {"$addToSet": {"members": discord_id}}
+        {"$addToSet": {"members": discord_id}, "$inc": {"version": 1}}
     )
     
     # Update user's team_id
@@ -1990,19 +2952,18 @@ async def transfer_staff_member(data: dict, user: User = Depends(require_admin))
         {"discord_id": discord_id},
         {"$set": {"team_id": new_team_id}}
     )
+    await invalidate_user_cache(discord_id)
     
     # Send DMs to all involved parties
-    asyncio.create_task(
-        send_transfer_notifications(
-            staff_member["discord_id"],
-            staff_member["username"],
-            old_team["head_admin_id"] if old_team else None,
-            old_team["name"] if old_team else "Ingen team",
-            new_team["head_admin_id"],
-            new_team["name"],
-            user.username
-        )
-    )
+    await notification_outbox.enqueue("staff_transfer", f"dm:{staff_member['discord_id']}", {
+        "staff_discord_id": staff_member["discord_id"],
+        "staff_username": staff_member["username"],
+        "old_head_admin_id": old_team["head_admin_id"] if old_team else None,
+        "old_team_name": old_team["name"] if old_team else "Ingen team",
+        "new_head_admin_id": new_team["head_admin_id"],
+        "new_team_name": new_team["name"],
+        "transferred_by": user.username
+    })
     
     return {"success": True, "message": f"{staff_member['username']} overført til {new_team['name']}"}
 
@@ -2020,7 +2981,7 @@ async def remove_staff_member_completely(discord_id: str, user: User = Depends(r
     if team_id:
         await db.staff_teams.update_one(
             {"id": team_id},
-            {"$pull": {"members": discord_id}}
+            {"$pull": {"members": discord_id}, "$inc": {"version": 1}}
         )
     
     # Update user to player role
@@ -2035,9 +2996,34 @@ async def remove_staff_member_completely(discord_id: str, user: User = Depends(r
             "strikes": 0
         }}
     )
+    await invalidate_user_cache(discord_id)
     
     return {"success": True, "message": f"{staff_member['username']} fjernet fra staff"}
 
+@api_router.post("/super-admin/staff/sync-roles")
+async def sync_staff_roles(team_id: Optional[str] = None, user: User = Depends(require_super_admin)):
+    """Queue a sync of the Discord staff roles with the database for one team, or every team.
+
+    The leader's bot runs it; the report shows up at GET /super-admin/staff/sync-roles.
+    """
+    if team_id and not await db.staff_teams.find_one({"id": team_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Team not found")
+    
+    report_id = role_sync_report_id(team_id)
+    await notification_outbox.enqueue("role_sync", "roles:sync", {"team_id": team_id}, coalesce_key=report_id)
+    return {"success": True, "queued": True, "team_id": team_id}
+
+@api_router.get("/super-admin/staff/sync-roles")
+async def get_staff_role_sync_report(team_id: Optional[str] = None, user: User = Depends(require_super_admin)):
+    """Report of the last role sync of a team (default: the full roster) and whether one is queued"""
+    report_id = role_sync_report_id(team_id)
+    report = await db.stats.find_one({"_id": report_id}, {"_id": 0})
+    queued = await notification_outbox.collection.count_documents({
+        "coalesce_key": report_id,
+        "status": {"$in": ["pending", "sending"]}
+    })
+    return {**(report or {}), "queued": queued > 0}
+
 @api_router.post("/super-admin/staff/add")
 async def add_staff_member(staff_data: AddStaffMember, user: User = Depends(require_admin)):
     # Check if user exists
@@ -2047,7 +3033,7 @@ async def add_staff_member(staff_data: AddStaffMember, user: User = Depends(requ
         # Update existing user
         await db.users.update_one(
             {"discord_id": staff_data.discord_id},
-            {"$set": {"role": "staff", "team_id": staff_data.team_id}}
+            {"$set": {"role": "staff", "staff_rank": "mod_elev", "team_id": staff_data.team_id}}
         )
     else:
         # Create new user entry
@@ -2056,27 +3042,28 @@ async def add_staff_member(staff_data: AddStaffMember, user: User = Depends(requ
             username=staff_data.username,
             is_admin=True,
             role="staff",
+            staff_rank="mod_elev",
             team_id=staff_data.team_id
         )
         await db.users.insert_one(new_user.model_dump())
+        await bump_stats({"total_users": 1})
+    await invalidate_user_cache(staff_data.discord_id)
     
     # Add to team
     await db.staff_teams.update_one(
         {"id": staff_data.team_id},
-        {"$addToSet": {"members": staff_data.discord_id}}
+        {"$addToSet": {"members": staff_data.discord_id}, "$inc": {"version": 1}}
     )
     
     # Get team info and notify head admin
     team = await db.staff_teams.find_one({"id": staff_data.team_id}, {"_id": 0})
     if team:
-        asyncio.create_task(
-            send_staff_assignment_dm(
-                team["head_admin_id"],
-                staff_data.username,
-                staff_data.discord_id,
-                team["name"]
-            )
-        )
+        await notification_outbox.enqueue("staff_assignment", f"dm:{team['head_admin_id']}", {
+            "head_admin_id": team["head_admin_id"],
+            "new_staff_username": staff_data.username,
+            "new_staff_id": staff_data.discord_id,
+            "team_name": team["name"]
+        })
     
     return {"success": True}
 
@@ -2092,64 +3079,501 @@ async def get_staff():
 # Stats endpoint
 @api_router.get("/stats")
 async def get_stats(user: User = Depends(require_admin)):
-    total_users = await db.users.count_documents({})
-    total_app_types = await db.application_types.count_documents({"active": True})
-    pending_apps = await db.applications.count_documents({"status": "pending"})
-    approved_apps = await db.applications.count_documents({"status": "approved"})
-    pending_reports = await db.reports.count_documents({"status": "pending"})
+    stats = await db.stats.find_one({"_id": STATS_DOC_ID})
+    if not stats:
+        stats = await reconcile_stats()
     
+    applications_by_status = stats.get("applications_by_status", {})
     return {
-        "total_users": total_users,
-        "total_application_types": total_app_types,
-        "pending_applications": pending_apps,
-        "approved_applications": approved_apps,
-        "pending_reports": pending_reports
+        "total_users": stats.get("total_users", 0),
+        "total_application_types": stats.get("total_application_types", 0),
+        "pending_applications": applications_by_status.get("pending", 0),
+        "approved_applications": applications_by_status.get("approved", 0),
+        "pending_reports": stats.get("reports_by_status", {}).get("pending", 0)
     }
 
+# Notification outbox status for super admins
+@api_router.get("/super-admin/notifications")
+async def get_notification_outbox(user: User = Depends(require_super_admin)):
+    """Queued/sent/failed Discord notification counts"""
+    return await notification_outbox.report()
+
+# Index report for super admins
+@api_router.get("/super-admin/indexes")
+async def get_indexes(user: User = Depends(require_super_admin)):
+    """Show which database indexes each endpoint uses"""
+    return await get_index_report()
+
 # Users endpoint for admin
-@api_router.get("/users", response_model=List[User])
-async def get_all_users(user: User = Depends(require_admin)):
-    """Get all users - for admin panel"""
-    users = await db.users.find({}, {"_id": 0}).to_list(10000)
-    return users
+USER_EXPORT_DEFAULT_FIELDS = list(User.model_fields)
+USER_EXPORT_BATCH_SIZE = 200
+
+async def stream_users(fields: List[str], ndjson: bool):
+    """Yield users straight from the Motor cursor as NDJSON lines or one JSON array.
+
+    Each document gets the User defaults for the fields it is missing, as a List[User] response would.
+    """
+    projection = {"_id": 0, **{field: 1 for field in fields}}
+    cursor = db.users.find({}, projection).batch_size(USER_EXPORT_BATCH_SIZE)
+    chunk = [] if ndjson else ["["]
+    first = True
+    async for user_doc in cursor:
+        user_doc = User.model_construct(**user_doc).model_dump(include=set(fields), warnings=False)
+        line = json.dumps(user_doc, default=str)
+        if ndjson:
+            chunk.append(line + "\n")
+        else:
+            chunk.append(line if first else "," + line)
+        first = False
+        if len(chunk) >= USER_EXPORT_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if not ndjson:
+        chunk.append("]")
+    if chunk:
+        yield "".join(chunk)
+
+@api_router.get("/users")
+async def get_all_users(
+    user: User = Depends(require_admin),
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+    fields: Optional[str] = None
+):
+    """Get all users - for admin panel. Streams the result instead of loading every user into memory.
+
+    `fields` is a comma separated list of User fields (default: all of them).
+    """
+    selected_fields = USER_EXPORT_DEFAULT_FIELDS
+    if fields:
+        selected_fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected_fields if field not in User.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown user fields: {', '.join(unknown)}")
+    
+    media_type = "application/x-ndjson" if output_format == "ndjson" else "application/json"
+    return StreamingResponse(stream_users(selected_fields, output_format == "ndjson"), media_type=media_type)
 
 # FiveM Admin Panel Endpoints
 FIVEM_SERVER_IP = "45.84.198.57"
 FIVEM_SERVER_PORT = "30120"
 
+# Pooled FiveM bridge client (one per process, keep-alive connections)
+FIVEM_MAX_CONNECTIONS = int(os.environ.get('FIVEM_MAX_CONNECTIONS', '20'))
+FIVEM_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('FIVEM_MAX_KEEPALIVE_CONNECTIONS', '10'))
+FIVEM_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get('FIVEM_KEEPALIVE_EXPIRY_SECONDS', '30'))
+FIVEM_DEFAULT_TIMEOUT_SECONDS = float(os.environ.get('FIVEM_DEFAULT_TIMEOUT_SECONDS', '5'))
+FIVEM_MAX_RETRIES = int(os.environ.get('FIVEM_MAX_RETRIES', '2'))
+FIVEM_RETRY_BACKOFF_SECONDS = float(os.environ.get('FIVEM_RETRY_BACKOFF_SECONDS', '0.25'))
+
+# Per-action timeouts (seconds); everything else uses FIVEM_DEFAULT_TIMEOUT_SECONDS
+FIVEM_ACTION_TIMEOUTS = {
+    "/players.json": 3.0,
+    "/info.json": 3.0,
+    "/dynamic.json": 3.0,
+    "/admin/announce": 3.0,
+    "/admin/ban": 10.0,
+    "/admin/clear-inventory": 10.0,
+    "/admin/wipe-player": 15.0,
+    "/admin/batch": 30.0,
+}
+# Max concurrent requests when a batch has to be sent action by action
+FIVEM_BATCH_CONCURRENCY = int(os.environ.get('FIVEM_BATCH_CONCURRENCY', '8'))
+
+class FiveMClient:
+    """Application-scoped HTTP client for the FiveM server and its admin bridge.
+
+    GETs are retried on transport errors and 5xx responses. Admin POSTs are not
+    idempotent (give-money, give-item...), so they are only retried when the
+    connection could not be opened, i.e. the request never reached the server.
+    """
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self._client = None
+        self.counters = {"requests": 0, "retries": 0, "failures": 0, "in_flight": 0}
+
+    def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=FIVEM_DEFAULT_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=FIVEM_MAX_CONNECTIONS,
+                    max_keepalive_connections=FIVEM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=FIVEM_KEEPALIVE_EXPIRY_SECONDS
+                )
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        self.start()
+        retry_on = (httpx.TransportError,) if method == "GET" else (httpx.ConnectError, httpx.ConnectTimeout)
+        timeout = FIVEM_ACTION_TIMEOUTS.get(path, FIVEM_DEFAULT_TIMEOUT_SECONDS)
+        
+        self.counters["requests"] += 1
+        self.counters["in_flight"] += 1
+        try:
+            for attempt in range(FIVEM_MAX_RETRIES + 1):
+                try:
+                    response = await self._client.request(method, path, timeout=timeout, **kwargs)
+                except retry_on:
+                    if attempt == FIVEM_MAX_RETRIES:
+                        raise
+                else:
+                    if method != "GET" or response.status_code < 500 or attempt == FIVEM_MAX_RETRIES:
+                        return response
+                self.counters["retries"] += 1
+                # Exponential backoff with jitter
+                await asyncio.sleep(FIVEM_RETRY_BACKOFF_SECONDS * (2 ** attempt) * (1 + random.random()))
+        except Exception:
+            self.counters["failures"] += 1
+            raise
+        finally:
+            self.counters["in_flight"] -= 1
+
+    async def get(self, path: str) -> httpx.Response:
+        return await self._request("GET", path)
+
+    async def post(self, path: str, json: dict) -> httpx.Response:
+        return await self._request("POST", path, json=json)
+
+    def pool_stats(self) -> dict:
+        connections = []
+        # httpx has no public pool API; read the httpcore pool when available
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        if pool is not None:
+            connections = list(getattr(pool, "connections", []))
+        return {
+            **self.counters,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+            "max_connections": FIVEM_MAX_CONNECTIONS,
+            "max_keepalive_connections": FIVEM_MAX_KEEPALIVE_CONNECTIONS
+        }
+
+fivem_client = FiveMClient(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}")
+
+# Shared snapshot of the online players, refreshed by one background poller per process
+FIVEM_PLAYERS_POLL_INTERVAL_SECONDS = float(os.environ.get('FIVEM_PLAYERS_POLL_INTERVAL_SECONDS', '5'))
+# Stop polling the game server when nobody has looked at the players for this long
+FIVEM_PLAYERS_IDLE_AFTER_SECONDS = float(os.environ.get('FIVEM_PLAYERS_IDLE_AFTER_SECONDS', '60'))
+FIVEM_STREAM_KEEPALIVE_SECONDS = 15
+FIVEM_STREAM_QUEUE_SIZE = 50
+
+# Uptime as seen by this backend: since the first successful poll after the server was last down
+FIVEM_DOWN_AFTER_FAILURES = 3
+fivem_online_since = None
+fivem_consecutive_failures = 0
+
+def record_fivem_poll(success: bool):
+    global fivem_online_since, fivem_consecutive_failures
+    if success:
+        fivem_consecutive_failures = 0
+        if fivem_online_since is None:
+            fivem_online_since = time.monotonic()
+    else:
+        fivem_consecutive_failures += 1
+        if fivem_consecutive_failures >= FIVEM_DOWN_AFTER_FAILURES:
+            fivem_online_since = None
+
+def format_fivem_uptime() -> str:
+    if fivem_online_since is None:
+        return "N/A"
+    minutes = int(time.monotonic() - fivem_online_since) // 60
+    return f"{minutes // 60}h {minutes % 60}m"
+
+def diff_players(old_players: list, new_players: list) -> dict:
+    """Joins, leaves and ping/name changes between two players.json lists (keyed by server id)"""
+    old_by_id = {player.get("id"): player for player in old_players}
+    new_by_id = {player.get("id"): player for player in new_players}
+    updated = []
+    for player_id, player in new_by_id.items():
+        old_player = old_by_id.get(player_id)
+        if old_player and (old_player.get("ping") != player.get("ping") or old_player.get("name") != player.get("name")):
+            updated.append({"id": player_id, "name": player.get("name"), "ping": player.get("ping")})
+    return {
+        "joined": [player for player_id, player in new_by_id.items() if player_id not in old_by_id],
+        "left": [player_id for player_id in old_by_id if player_id not in new_by_id],
+        "updated": updated
+    }
+
+class FiveMPlayerSnapshot:
+    """Latest players.json, shared by every request.
+
+    Concurrent refreshes are coalesced (singleflight) so N open admin panels cost
+    the game server one players.json request per poll interval.
+    """
+    def __init__(self):
+        self.players = []
+        self.fetched_at = None  # time.monotonic() of the last successful fetch
+        self.failed_at = None  # time.monotonic() of the last failed fetch, cleared by a success
+        self.last_error = None
+        self.last_requested_at = 0.0
+        self._refresh_task = None
+        self._subscribers = set()  # asyncio.Queue per live feed connection
+
+    def is_fresh(self) -> bool:
+        return self.fetched_at is not None and time.monotonic() - self.fetched_at < FIVEM_PLAYERS_POLL_INTERVAL_SECONDS
+
+    async def _fetch(self):
+        try:
+            response = await fivem_client.get("/players.json")
+            players = response.json()
+            diff = diff_players(self.players, players)
+            self.players = players
+            self.fetched_at = time.monotonic()
+            self.failed_at = None
+            self.last_error = None
+            record_fivem_poll(True)
+            if diff["joined"] or diff["left"] or diff["updated"]:
+                self._publish(("diff", diff))
+        except Exception as e:
+            # Keep serving the last known players
+            self.failed_at = time.monotonic()
+            self.last_error = str(e)
+            record_fivem_poll(False)
+            print(f"Error fetching FiveM players: {e}")
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+        return self._refresh_task
+
+    async def refresh(self):
+        """Fetch players.json, joining the refresh already in flight if there is one"""
+        # shield: a cancelled request must not cancel the refresh other callers wait on
+        await asyncio.shield(self._start_refresh())
+
+    async def get(self) -> list:
+        self.last_requested_at = time.monotonic()
+        if self.is_fresh():
+            return self.players
+        if self.failed_at is None:
+            await self.refresh()
+        elif time.monotonic() - self.failed_at >= FIVEM_PLAYERS_POLL_INTERVAL_SECONDS:
+            # The game server is failing: retry in the background at most once per poll interval
+            # and answer with the last known players instead of waiting on it
+            self._start_refresh()
+        return self.players
+
+    def is_watched(self) -> bool:
+        return bool(self._subscribers) or time.monotonic() - self.last_requested_at < FIVEM_PLAYERS_IDLE_AFTER_SECONDS
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=FIVEM_STREAM_QUEUE_SIZE)
+        queue.put_nowait(("snapshot", self.players))
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _publish(self, event: tuple):
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: drop its backlog and resync it with a full snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("snapshot", self.players))
+
+    async def poll(self):
+        """Background task keeping the snapshot fresh while someone is watching"""
+        while True:
+            try:
+                if self.is_watched():
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in FiveM player poller: {e}")
+            await asyncio.sleep(FIVEM_PLAYERS_POLL_INTERVAL_SECONDS)
+
+fivem_players = FiveMPlayerSnapshot()
+
+class CachedFiveMJson:
+    """A FiveM JSON endpoint cached for `ttl` seconds with stale-while-revalidate.
+
+    Once a value exists, a stale read returns it immediately and refreshes in the
+    background, so a slow game server never blocks the panel.
+    """
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self.value = None
+        self.fetched_at = None
+        self._refresh_task = None
+
+    async def _fetch(self):
+        try:
+            response = await fivem_client.get(self.path)
+            value = response.json()
+            if not isinstance(value, dict):
+                raise ValueError(f"expected a JSON object, got {type(value).__name__}")
+            self.value = value
+            self.fetched_at = time.monotonic()
+            record_fivem_poll(True)
+        except Exception as e:
+            record_fivem_poll(False)
+            print(f"Error fetching FiveM {self.path}: {e}")
+
+    def refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+        return self._refresh_task
+
+    async def get(self):
+        if self.value is None:
+            await asyncio.shield(self.refresh())
+        elif time.monotonic() - self.fetched_at >= self.ttl:
+            self.refresh()
+        return self.value
+
+# info.json (resources, convars) barely changes; dynamic.json (player count) does
+fivem_info = CachedFiveMJson("/info.json", float(os.environ.get('FIVEM_INFO_TTL_SECONDS', '300')))
+fivem_dynamic = CachedFiveMJson("/dynamic.json", float(os.environ.get('FIVEM_DYNAMIC_TTL_SECONDS', '10')))
+
+@api_router.get("/fivem/pool-stats")
+async def get_fivem_pool_stats(user: User = Depends(require_admin)):
+    """Connection pool and request counters of the FiveM client"""
+    return fivem_client.pool_stats()
+
 @api_router.get("/fivem/players")
 async def get_fivem_players(user: User = Depends(require_admin)):
-    """Get online players from FiveM server"""
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/players.json")
-            players = response.json()
-            return {"players": players}
-    except Exception as e:
-        print(f"Error fetching FiveM players: {e}")
-        return {"players": []}
+    """Get online players from FiveM server (served from the shared snapshot)"""
+    players = await fivem_players.get()
+    return {"players": players}
+
+@api_router.get("/fivem/players/stream")
+async def stream_fivem_players(request: Request, user: User = Depends(require_admin)):
+    """Server-Sent Events feed: a `snapshot` of the players, then `diff` events (joined/left/updated)"""
+    async def event_stream():
+        # Subscribed only once the response starts streaming, so a client that is gone
+        # before then never leaves a queue behind
+        queue = fivem_players.subscribe()
+        if not fivem_players.is_fresh():
+            asyncio.create_task(fivem_players.refresh())
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=FIVEM_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # SSE comment line keeps proxies from closing the idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            fivem_players.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def parse_max_clients(*values, default: int = 64) -> int:
+    """First value that is a positive player count; FiveM sends convars as strings"""
+    for value in values:
+        try:
+            max_clients = int(value)
+        except (TypeError, ValueError):
+            continue
+        if max_clients > 0:
+            return max_clients
+    return default
 
 @api_router.get("/fivem/stats")
 async def get_fivem_stats(user: User = Depends(require_admin)):
     """Get server stats"""
+    # Both documents are fetched concurrently (and usually come from cache)
+    info, dynamic = await asyncio.gather(fivem_info.get(), fivem_dynamic.get())
+    info = info or {}
+    dynamic = dynamic or {}
+    convars = info.get("vars")
+    
+    return {
+        "maxPlayers": parse_max_clients(
+            dynamic.get("sv_maxclients"),
+            convars.get("sv_maxClients") if isinstance(convars, dict) else None
+        ),
+        "uptime": format_fivem_uptime(),
+        # FiveM lists resources in info.json; dynamic.json is kept as a fallback
+        "resources": len(info.get("resources") or dynamic.get("resources", []))
+    }
+
+# Plain text the bridge answers unknown paths with (resources from before /admin/batch)
+FIVEM_BRIDGE_BANNER = "Redicate Admin Panel"
+
+def fivem_bridge_lacks_batch(response: httpx.Response) -> bool:
+    """True when /admin/batch was not handled at all: a 404, or the banner for unknown paths"""
+    if response.status_code == 404:
+        return True
+    return response.status_code == 200 and response.text.startswith(FIVEM_BRIDGE_BANNER)
+
+async def run_fivem_actions_individually(payloads: List[dict]) -> dict:
+    """Send each action to its own /admin/<action> endpoint, at most FIVEM_BATCH_CONCURRENCY at a time"""
+    print("FiveM bridge has no /admin/batch handler, sending actions individually")
+    semaphore = asyncio.Semaphore(FIVEM_BATCH_CONCURRENCY)
+    
+    async def run_action(payload: dict) -> dict:
+        result = {"action": payload["action"], "player_id": payload["player_id"]}
+        async with semaphore:
+            try:
+                await fivem_client.post(f"/admin/{payload['action']}", json=payload)
+                return {**result, "success": True}
+            except Exception as e:
+                return {**result, "success": False, "error": str(e)}
+    
+    results = await asyncio.gather(*[run_action(payload) for payload in payloads])
+    return {"success": all(result["success"] for result in results), "results": results}
+
+@api_router.post("/fivem/batch")
+async def run_fivem_batch(batch: FiveMBatchRequest, user: User = Depends(require_admin)):
+    """Run many admin actions at once, e.g. heal or freeze every player during an event.
+
+    The whole batch goes to the bridge's /admin/batch in one request. Resources without
+    that handler get the actions one by one; any other bad reply fails the batch, since
+    the bridge may already have run it.
+    """
+    payloads = [{**action.model_dump(), "admin": user.username} for action in batch.actions]
+    
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            # Get server info
-            info_response = await client.get(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/info.json")
-            info = info_response.json()
-            
-            # Get dynamic info
-            dynamic_response = await client.get(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/dynamic.json")
-            dynamic = dynamic_response.json()
-            
-            return {
-                "maxPlayers": info.get("vars", {}).get("sv_maxClients", 64),
-                "uptime": "24h 15m",  # You can calculate from server start time
-                "resources": len(dynamic.get("resources", []))
-            }
+        response = await fivem_client.post("/admin/batch", json={"admin": user.username, "actions": payloads})
     except Exception as e:
-        print(f"Error fetching FiveM stats: {e}")
-        return {"maxPlayers": 64, "uptime": "N/A", "resources": 0}
+        # Not retried action by action: the bridge may already have run part of the batch
+        raise HTTPException(status_code=500, detail=f"Failed to run batch: {str(e)}")
+    
+    if fivem_bridge_lacks_batch(response):
+        return await run_fivem_actions_individually(payloads)
+    
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    results = body.get("results") if isinstance(body, dict) else None
+    if (
+        response.status_code >= 400
+        or not isinstance(results, list)
+        or len(results) != len(payloads)
+        or not all(isinstance(result, dict) for result in results)
+    ):
+        # The bridge may have run some or all of the actions, so they are not resent
+        raise HTTPException(
+            status_code=502,
+            detail=f"FiveM bridge sent an invalid batch reply (HTTP {response.status_code}), check the server before retrying"
+        )
+    
+    return {
+        "success": all(result.get("success") for result in results),
+        "results": [
+            {"action": payload["action"], "player_id": payload["player_id"], **result}
+            for payload, result in zip(payloads, results)
+        ]
+    }
 
 @api_router.post("/fivem/kick")
 async def kick_player(data: dict, user: User = Depends(require_admin)):
@@ -2159,11 +3583,10 @@ async def kick_player(data: dict, user: User = Depends(require_admin)):
     
     # Send command to FiveM server
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(
-                f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/kick",
-                json={"player_id": player_id, "reason": reason, "admin": user.username}
-            )
+        await fivem_client.post(
+            "/admin/kick",
+            json={"player_id": player_id, "reason": reason, "admin": user.username}
+        )
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to kick player: {str(e)}")
@@ -2176,11 +3599,10 @@ async def ban_player(data: dict, user: User = Depends(require_admin)):
     duration = data.get("duration", 0)
     
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(
-                f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/ban",
-                json={"player_id": player_id, "reason": reason, "duration": duration, "admin": user.username}
-            )
+        await fivem_client.post(
+            "/admin/ban",
+            json={"player_id": player_id, "reason": reason, "duration": duration, "admin": user.username}
+        )
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to ban player: {str(e)}")
@@ -2192,11 +3614,10 @@ async def teleport_player(data: dict, user: User = Depends(require_admin)):
     coordinates = data.get("coordinates")
     
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(
-                f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/teleport",
-                json={"player_id": player_id, "coordinates": coordinates, "admin": user.username}
-            )
+        await fivem_client.post(
+            "/admin/teleport",
+            json={"player_id": player_id, "coordinates": coordinates, "admin": user.username}
+        )
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to teleport player: {str(e)}")
@@ -2207,11 +3628,10 @@ async def heal_player(data: dict, user: User = Depends(require_admin)):
     player_id = data.get("player_id")
     
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(
-                f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/heal",
-                json={"player_id": player_id, "admin": user.username}
-            )
+        await fivem_client.post(
+            "/admin/heal",
+            json={"player_id": player_id, "admin": user.username}
+        )
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to heal player: {str(e)}")
@@ -2221,9 +3641,8 @@ async def send_announcement(data: dict, user: User = Depends(require_admin)):
     """Send announcement to all players"""
     message = data.get("message")
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/announce",
-                json={"message": message, "admin": user.username})
+        await fivem_client.post("/admin/announce",
+            json={"message": message, "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2231,9 +3650,8 @@ async def send_announcement(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/revive")
 async def revive_player(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/revive",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/revive",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2241,9 +3659,8 @@ async def revive_player(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/armor")
 async def give_armor(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/armor",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/armor",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2251,9 +3668,8 @@ async def give_armor(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/freeze")
 async def freeze_player(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/freeze",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/freeze",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2261,9 +3677,8 @@ async def freeze_player(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/unfreeze")
 async def unfreeze_player(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/unfreeze",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/unfreeze",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2271,10 +3686,9 @@ async def unfreeze_player(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/give-money")
 async def give_money(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/give-money",
-                json={"player_id": data.get("player_id"), "amount": data.get("amount"), 
-                      "account": data.get("account"), "admin": user.username})
+        await fivem_client.post("/admin/give-money",
+            json={"player_id": data.get("player_id"), "amount": data.get("amount"), 
+                  "account": data.get("account"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2282,10 +3696,9 @@ async def give_money(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/set-job")
 async def set_job(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/set-job",
-                json={"player_id": data.get("player_id"), "job": data.get("job"), 
-                      "grade": data.get("grade"), "admin": user.username})
+        await fivem_client.post("/admin/set-job",
+            json={"player_id": data.get("player_id"), "job": data.get("job"), 
+                  "grade": data.get("grade"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2293,10 +3706,9 @@ async def set_job(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/give-item")
 async def give_item(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/give-item",
-                json={"player_id": data.get("player_id"), "item": data.get("item"), 
-                      "count": data.get("count"), "admin": user.username})
+        await fivem_client.post("/admin/give-item",
+            json={"player_id": data.get("player_id"), "item": data.get("item"), 
+                  "count": data.get("count"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2304,10 +3716,9 @@ async def give_item(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/give-weapon")
 async def give_weapon(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/give-weapon",
-                json={"player_id": data.get("player_id"), "weapon": data.get("weapon"), 
-                      "ammo": data.get("ammo"), "admin": user.username})
+        await fivem_client.post("/admin/give-weapon",
+            json={"player_id": data.get("player_id"), "weapon": data.get("weapon"), 
+                  "ammo": data.get("ammo"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2315,9 +3726,8 @@ async def give_weapon(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/bring")
 async def bring_player(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/bring",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/bring",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2325,9 +3735,8 @@ async def bring_player(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/goto")
 async def goto_player(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/goto",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/goto",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2335,9 +3744,8 @@ async def goto_player(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/spectate")
 async def spectate_player(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/spectate",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/spectate",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2345,9 +3753,8 @@ async def spectate_player(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/clear-inventory")
 async def clear_inventory(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/clear-inventory",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/clear-inventory",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2355,9 +3762,8 @@ async def clear_inventory(data: dict, user: User = Depends(require_admin)):
 @api_router.post("/fivem/wipe-player")
 async def wipe_player(data: dict, user: User = Depends(require_admin)):
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(f"http://{FIVEM_SERVER_IP}:{FIVEM_SERVER_PORT}/admin/wipe-player",
-                json={"player_id": data.get("player_id"), "admin": user.username})
+        await fivem_client.post("/admin/wipe-player",
+            json={"player_id": data.get("player_id"), "admin": user.username})
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2371,6 +3777,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 logging.basicConfig(
@@ -2379,70 +3786,656 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-async def check_probation_periods():
-    """Background task to check and upgrade staff from probation"""
-    while True:
+# Discord notification outbox
+# Handlers only write a job to `notification_outbox`; a pool of workers delivers it once the
+# bot is connected. Jobs are claimed with a lease, so a crash or restart never loses one.
+# Role updates requested on a worker without the bot go through the same queue.
+NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', '4'))
+NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', '8'))
+NOTIFICATION_RETRY_BASE_SECONDS = float(os.environ.get('NOTIFICATION_RETRY_BASE_SECONDS', '5'))
+NOTIFICATION_RETRY_MAX_SECONDS = float(os.environ.get('NOTIFICATION_RETRY_MAX_SECONDS', '900'))
+# A job still "sending" after this long belonged to a worker that died; it is claimed again
+NOTIFICATION_LEASE_SECONDS = int(os.environ.get('NOTIFICATION_LEASE_SECONDS', '120'))
+# Coalesced jobs wait this long so a burst of updates collapses into one message
+NOTIFICATION_COALESCE_WINDOW_SECONDS = float(os.environ.get('NOTIFICATION_COALESCE_WINDOW_SECONDS', '5'))
+# Minimum spacing between two sends on the same route (channel or DM recipient)
+NOTIFICATION_ROUTE_INTERVAL_SECONDS = float(os.environ.get('NOTIFICATION_ROUTE_INTERVAL_SECONDS', '1'))
+NOTIFICATION_POLL_INTERVAL_SECONDS = float(os.environ.get('NOTIFICATION_POLL_INTERVAL_SECONDS', '2'))
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', '7'))
+
+class NotificationOutbox:
+    """Persistent queue of Discord notifications, delivered one send at a time per route"""
+    def __init__(self, collection, handlers: dict):
+        self.collection = collection
+        self.handlers = handlers  # kind -> coroutine function called with the job's args
+        self._busy_routes = set()
+        self._route_ready_at = {}  # route -> monotonic time before which it must not be used
+        self._claim_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+
+    async def enqueue(self, kind: str, route: str, args: dict, coalesce_key: str = None, ref: str = None):
+        """Queue a notification. `route` is its rate-limit bucket, e.g. "dm:<discord_id>".
+
+        A pending job with the same coalesce_key is updated in place, so only the latest args are sent.
+        `ref` tags the job with what caused it (e.g. "strike:<id>") so callers can look up its status.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown notification kind: {kind}")
+        now = datetime.now(timezone.utc)
+        job = {
+            "kind": kind,
+            "route": route,
+            "status": "pending",
+            "attempts": 0,
+            "created_at": now,
+            "last_error": None
+        }
+        if ref:
+            job["ref"] = ref
+        if coalesce_key:
+            for attempt in range(2):
+                try:
+                    await self.collection.update_one(
+                        {"coalesce_key": coalesce_key, "status": "pending"},
+                        {
+                            "$set": {"args": args, "updated_at": now},
+                            "$setOnInsert": {
+                                **job,
+                                "coalesce_key": coalesce_key,
+                                "next_attempt_at": now + timedelta(seconds=NOTIFICATION_COALESCE_WINDOW_SECONDS)
+                            }
+                        },
+                        upsert=True
+                    )
+                    break
+                except DuplicateKeyError:
+                    # A concurrent enqueue inserted the pending job first (coalesce_key_pending_unique);
+                    # the retry matches it and updates its args instead
+                    if attempt:
+                        raise
+        else:
+            await self.collection.insert_one({**job, "args": args, "updated_at": now, "next_attempt_at": now})
+        self._wakeup.set()
+
+    async def _claim(self) -> Optional[dict]:
+        # Serialised so two local workers never pick jobs for the same route at once
+        async with self._claim_lock:
+            now = datetime.now(timezone.utc)
+            clock = time.monotonic()
+            blocked = self._busy_routes | {route for route, ready_at in self._route_ready_at.items() if ready_at > clock}
+            job = await self.collection.find_one_and_update(
+                {
+                    "$or": [
+                        {"status": "pending", "next_attempt_at": {"$lte": now}},
+                        {"status": "sending", "locked_until": {"$lte": now}}
+                    ],
+                    "route": {"$nin": list(blocked)}
+                },
+                {
+                    "$set": {
+                        "status": "sending",
+                        "locked_until": now + timedelta(seconds=NOTIFICATION_LEASE_SECONDS),
+                        "claimed_by": WORKER_ID
+                    },
+                    "$inc": {"attempts": 1}
+                },
+                sort=[("next_attempt_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if job:
+                self._busy_routes.add(job["route"])
+            return job
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds Discord asked us to wait, if the error was a 429"""
+        if isinstance(error, discord.RateLimited):
+            return error.retry_after
+        if isinstance(error, discord.HTTPException) and error.status == 429:
+            try:
+                return float(error.response.headers.get("Retry-After", 1))
+            except (AttributeError, TypeError, ValueError):
+                return 1.0
+        return None
+
+    async def _finish(self, job: dict, status: str, error: str = None):
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"_id": job["_id"]},
+            {"$set": {
+                "status": status,
+                "finished_at": now,
+                "locked_until": None,
+                "last_error": error,
+                "expires_at": now + timedelta(days=NOTIFICATION_RETENTION_DAYS)
+            }}
+        )
+        if status == "failed":
+            print(f"❌ Gave up on {job['kind']} notification for {job['route']}: {error}")
+
+    async def _deliver(self, job: dict):
+        route = job["route"]
+        handler = self.handlers.get(job["kind"])
         try:
-            await asyncio.sleep(3600)  # Check every hour
-            
-            # Find users whose probation has ended
-            now = datetime.now(timezone.utc).isoformat()
-            expired_probations = await db.users.find({
-                "on_probation": True,
-                "probation_end_date": {"$lte": now}
-            }).to_list(None)
-            
-            for user in expired_probations:
-                print(f"🔄 Processing probation upgrade for {user['username']}")
-                
-                # Upgrade Discord roles
-                success = await upgrade_from_probation(user['discord_id'])
-                
-                if success:
-                    # Update database
-                    await db.users.update_one(
-                        {"discord_id": user["discord_id"]},
+            if not handler:
+                await self._finish(job, "failed", f"Unknown notification kind: {job['kind']}")
+                return
+            await handler(**job["args"])
+        except (discord.Forbidden, discord.NotFound) as e:
+            # DMs disabled, channel deleted... retrying will not help
+            await self._finish(job, "failed", str(e))
+        except Exception as e:
+            retry_after = self._retry_after(e)
+            if retry_after:
+                self._route_ready_at[route] = time.monotonic() + retry_after
+            if job["attempts"] >= NOTIFICATION_MAX_ATTEMPTS:
+                await self._finish(job, "failed", str(e))
+            else:
+                delay = retry_after or min(
+                    NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1),
+                    NOTIFICATION_RETRY_MAX_SECONDS
+                )
+                try:
+                    await self.collection.update_one(
+                        {"_id": job["_id"]},
                         {"$set": {
-                            "on_probation": False,
-                            "probation_end_date": None
+                            "status": "pending",
+                            "next_attempt_at": datetime.now(timezone.utc) + timedelta(seconds=delay),
+                            "locked_until": None,
+                            "last_error": str(e)
                         }}
                     )
-                    print(f"✅ Successfully upgraded {user['username']} from probation")
-                    
-                    # Send DM to user
-                    try:
-                        if discord_bot_client and discord_bot_ready:
-                            discord_user = await discord_bot_client.fetch_user(int(user['discord_id']))
-                            if discord_user:
-                                embed = discord.Embed(
-                                    title="🎉 Probation Afsluttet!",
-                                    description=f"Tillykke **{user['username']}**! Du har gennemført din probation periode.",
-                                    color=discord.Color.green(),
-                                    timestamp=datetime.now(timezone.utc)
-                                )
-                                embed.add_field(
-                                    name="✅ Hvad betyder det?",
-                                    value="• Du er nu fuldt staff medlem\n• Du har fået din permanente staff rolle\n• Fortsæt det gode arbejde!",
-                                    inline=False
-                                )
-                                embed.set_footer(text="Redicate RP Staff System")
-                                await discord_user.send(embed=embed)
-                    except Exception as dm_error:
-                        print(f"Could not send probation completion DM: {dm_error}")
-                
+                except DuplicateKeyError:
+                    # A newer job with the same coalesce_key was queued while this one was sending;
+                    # it carries the latest args, so this one is dropped
+                    await self._finish(job, "superseded", str(e))
+        else:
+            await self._finish(job, "sent")
+        finally:
+            self._busy_routes.discard(route)
+            self._route_ready_at[route] = max(
+                self._route_ready_at.get(route, 0),
+                time.monotonic() + NOTIFICATION_ROUTE_INTERVAL_SECONDS
+            )
+
+    async def _wait(self):
+        """Sleep until a job is enqueued locally, a blocked route frees up or the poll interval passes"""
+        clock = time.monotonic()
+        # Forget routes whose spacing has passed
+        self._route_ready_at = {route: ready_at for route, ready_at in self._route_ready_at.items() if ready_at > clock}
+        timeout = min([NOTIFICATION_POLL_INTERVAL_SECONDS] + [ready_at - clock for ready_at in self._route_ready_at.values()])
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def worker(self):
+        while True:
+            try:
+                # Keep everything queued until the bot is connected
+                if not discord_bot_client or not discord_bot_ready:
+                    await asyncio.sleep(NOTIFICATION_POLL_INTERVAL_SECONDS)
+                    continue
+                job = await self._claim()
+                if job:
+                    await self._deliver(job)
+                else:
+                    await self._wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in notification worker: {e}")
+                await asyncio.sleep(5)
+
+    async def status(self, ref: str) -> dict:
+        """Delivery state of the jobs tagged with `ref`, by kind"""
+        jobs = await self.collection.find(
+            {"ref": ref},
+            {"_id": 0, "kind": 1, "status": 1, "attempts": 1, "last_error": 1, "finished_at": 1}
+        ).to_list(None)
+        return {
+            job["kind"]: {
+                "status": job["status"],
+                "attempts": job["attempts"],
+                "last_error": job.get("last_error"),
+                "finished_at": job["finished_at"].isoformat() if job.get("finished_at") else None
+            }
+            for job in jobs
+        }
+
+    def start(self):
+        for _ in range(NOTIFICATION_WORKERS):
+            asyncio.create_task(self.worker())
+
+    async def report(self) -> dict:
+        oldest = await self.collection.find_one(
+            {"status": {"$in": ["pending", "sending"]}},
+            {"created_at": 1},
+            sort=[("created_at", 1)]
+        )
+        return {
+            "by_status": await count_by_status(self.collection),
+            "oldest_queued_at": oldest["created_at"].isoformat() if oldest else None,
+            "busy_routes": sorted(self._busy_routes)
+        }
+
+def raise_on_failure(role_update):
+    """Outbox handler for the role helpers, which report failure by returning False"""
+    async def handler(**kwargs):
+        if not await role_update(**kwargs):
+            raise RuntimeError(f"{role_update.__name__} failed")
+    return handler
+
+notification_outbox = NotificationOutbox(db.notification_outbox, {
+    "application_review": send_discord_embed,
+    "staff_assignment": send_staff_assignment_dm,
+    "report_status": send_report_status_notification,
+    "punishment_proposal": send_punishment_to_channel,
+    "punishment_decision": send_punishment_decision_to_reporter,
+    "strike": send_strike_notification_dm,
+    "staff_transfer": send_transfer_notifications,
+    "probation_complete": send_probation_complete_dm,
+    "probation_role": raise_on_failure(give_probation_role),
+    "staff_rank": raise_on_failure(update_discord_roles),
+    "firing_request": request_firing,
+    "role_sync": reconcile_staff_roles,
+})
+
+# Scheduled jobs
+# One-off jobs with a due time (e.g. the end of a probation period) live in `scheduled_jobs`.
+# The scheduler sleeps until the earliest one is due and claims jobs with a lease, so it can
+# run on several workers and picks up where it left off after a restart.
+SCHEDULER_LEASE_SECONDS = int(os.environ.get('SCHEDULER_LEASE_SECONDS', '300'))
+# Upper bound on the sleep, i.e. how late a job scheduled by another worker can be noticed
+SCHEDULER_MAX_SLEEP_SECONDS = float(os.environ.get('SCHEDULER_MAX_SLEEP_SECONDS', '60'))
+SCHEDULER_MAX_ATTEMPTS = int(os.environ.get('SCHEDULER_MAX_ATTEMPTS', '20'))
+SCHEDULER_RETRY_BASE_SECONDS = float(os.environ.get('SCHEDULER_RETRY_BASE_SECONDS', '60'))
+SCHEDULER_RETRY_MAX_SECONDS = float(os.environ.get('SCHEDULER_RETRY_MAX_SECONDS', '3600'))
+SCHEDULER_RETENTION_DAYS = int(os.environ.get('SCHEDULER_RETENTION_DAYS', '30'))
+
+class JobScheduler:
+    """Runs the jobs in the scheduled_jobs collection at their due time"""
+    def __init__(self, collection, handlers: dict):
+        self.collection = collection
+        self.handlers = handlers  # kind -> coroutine function called with the job's args
+        self._wakeup = asyncio.Event()
+
+    async def schedule(self, job_id: str, kind: str, due_at: datetime, args: dict):
+        """Create the job, or move it to due_at if it already exists"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    "kind": kind,
+                    "args": args,
+                    "due_at": due_at,
+                    "status": "scheduled",
+                    "attempts": 0,
+                    "locked_until": None,
+                    "last_error": None,
+                    "updated_at": now
+                },
+                "$setOnInsert": {"created_at": now},
+                "$unset": {"expires_at": ""}
+            },
+            upsert=True
+        )
+        # Re-plan the sleep in case this job is due before the one we are waiting for
+        self._wakeup.set()
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "scheduled", "due_at": {"$lte": now}},
+                    {"status": "running", "locked_until": {"$lte": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "locked_until": now + timedelta(seconds=SCHEDULER_LEASE_SECONDS),
+                    "claimed_by": WORKER_ID
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("due_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _run_job(self, job: dict):
+        now = datetime.now(timezone.utc)
+        handler = self.handlers.get(job["kind"])
+        try:
+            if not handler:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            await handler(**job["args"])
         except Exception as e:
-            print(f"Error in probation check: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"❌ Scheduled job {job['_id']} failed (attempt {job['attempts']}): {e}")
+            if job["attempts"] >= SCHEDULER_MAX_ATTEMPTS:
+                update = {"status": "failed", "expires_at": now + timedelta(days=SCHEDULER_RETENTION_DAYS)}
+            else:
+                delay = min(SCHEDULER_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1), SCHEDULER_RETRY_MAX_SECONDS)
+                update = {"status": "scheduled", "due_at": now + timedelta(seconds=delay)}
+            update.update({"locked_until": None, "last_error": str(e)})
+        else:
+            update = {
+                "status": "done",
+                "finished_at": now,
+                "locked_until": None,
+                "expires_at": now + timedelta(days=SCHEDULER_RETENTION_DAYS)
+            }
+        # Only if we still hold the job - it may have been rescheduled meanwhile
+        await self.collection.update_one({"_id": job["_id"], "status": "running", "claimed_by": WORKER_ID}, {"$set": update})
+
+    async def _seconds_until_next(self) -> float:
+        next_job = await self.collection.find_one({"status": "scheduled"}, {"due_at": 1}, sort=[("due_at", 1)])
+        if not next_job:
+            return SCHEDULER_MAX_SLEEP_SECONDS
+        due_at = next_job["due_at"]
+        if due_at.tzinfo is None:
+            due_at = due_at.replace(tzinfo=timezone.utc)
+        seconds = (due_at - datetime.now(timezone.utc)).total_seconds()
+        return max(0.0, min(seconds, SCHEDULER_MAX_SLEEP_SECONDS))
+
+    async def run(self):
+        while True:
+            try:
+                job = await self._claim()
+                if job:
+                    await self._run_job(job)
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), await self._seconds_until_next())
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in job scheduler: {e}")
+                await asyncio.sleep(5)
+
+async def complete_probation(discord_id: str):
+    """Scheduled at the end of a probation period: swap the probation role for perm staff"""
+    user = await db.users.find_one({"discord_id": discord_id}, {"_id": 0, "username": 1, "on_probation": 1})
+    if not user or not user.get("on_probation"):
+        # Fired or already upgraded in the meantime
+        return
+    
+    print(f"🔄 Processing probation upgrade for {user['username']}")
+    
+    # Upgrade Discord roles (raising makes the scheduler retry with backoff)
+    if not await upgrade_from_probation(discord_id):
+        raise RuntimeError(f"Could not upgrade Discord roles of {discord_id}")
+    
+    await db.users.update_one(
+        {"discord_id": discord_id},
+        {"$set": {
+            "on_probation": False,
+            "probation_end_date": None
+        }}
+    )
+    await invalidate_user_cache(discord_id)
+    print(f"✅ Successfully upgraded {user['username']} from probation")
+    
+    await notification_outbox.enqueue("probation_complete", f"dm:{discord_id}", {
+        "discord_id": discord_id,
+        "username": user["username"]
+    })
+
+job_scheduler = JobScheduler(db.scheduled_jobs, {
+    "probation_end": complete_probation,
+})
+
+async def schedule_probation_end(discord_id: str, probation_end: datetime):
+    await job_scheduler.schedule(f"probation_end:{discord_id}", "probation_end", probation_end, {"discord_id": discord_id})
+
+async def sync_probation_jobs():
+    """Make sure everyone on probation has a pending job (covers users from before the scheduler and failed jobs)"""
+    users = await db.users.find(
+        {"on_probation": True},
+        {"_id": 0, "discord_id": 1, "probation_end_date": 1}
+    ).to_list(None)
+    pending = await job_scheduler.collection.find(
+        {"_id": {"$in": [f"probation_end:{user['discord_id']}" for user in users]}, "status": {"$in": ["scheduled", "running"]}},
+        {"_id": 1}
+    ).to_list(None)
+    pending_ids = {job["_id"] for job in pending}
+    
+    for user in users:
+        if f"probation_end:{user['discord_id']}" in pending_ids:
+            continue
+        try:
+            probation_end = datetime.fromisoformat(user["probation_end_date"])
+        except (TypeError, ValueError):
+            probation_end = datetime.now(timezone.utc)
+        await schedule_probation_end(user["discord_id"], probation_end)
+
+# One-time migration of the notes that used to be $pushed into users.notes
+NOTES_MIGRATION_ID = "staff_notes"
+LEGACY_STRIKE_NOTE = re.compile(r"⚠️ Strike (\d+)/3: (.*)", re.DOTALL)
+LEGACY_STRIKE_REMOVED_NOTE = re.compile(r"✅ Strike fjernet.*→ (\d+)\)", re.DOTALL)
+LEGACY_UPRANK_NOTE = re.compile(r"🎉 Upranket fra (\S+) til (\S+)")
+
+def legacy_note_details(text: str) -> dict:
+    """Recover the type (and type-specific fields) of an old free-text note"""
+    if match := LEGACY_STRIKE_NOTE.match(text):
+        return {"type": "strike", "strike_number": int(match.group(1)), "reason": match.group(2)}
+    if match := LEGACY_STRIKE_REMOVED_NOTE.match(text):
+        return {"type": "strike_removed", "strike_number": int(match.group(1))}
+    if match := LEGACY_UPRANK_NOTE.match(text):
+        return {"type": "uprank", "old_rank": match.group(1), "new_rank": match.group(2)}
+    return {"type": "note"}
+
+async def migrate_user_notes():
+    """Move users.notes into staff_notes and drop the array (runs until it has completed once).
+
+    Note ids are derived from the user and position, so a worker that crashes halfway or races
+    another worker's migration re-inserts the same documents instead of duplicating them.
+    """
+    if await db.migrations.find_one({"_id": NOTES_MIGRATION_ID}) is not None:
+        return
+    
+    migrated = 0
+    async for user in db.users.find({"notes": {"$exists": True}}, {"_id": 0, "discord_id": 1, "notes": 1}):
+        notes = []
+        for position, note in enumerate(user.get("notes") or []):
+            text = note.get("text", "")
+            notes.append(StaffNote(
+                id=str(uuid.uuid5(uuid.NAMESPACE_OID, f"{user['discord_id']}:{position}")),
+                discord_id=user["discord_id"],
+                text=text,
+                added_by=note.get("added_by", ""),
+                added_at=note.get("added_at", ""),
+                **legacy_note_details(text)
+            ).model_dump(exclude_none=True))
+        if notes:
+            try:
+                await db.staff_notes.insert_many(notes, ordered=False)
+            except BulkWriteError as e:
+                if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                    raise
+        await db.users.update_one({"discord_id": user["discord_id"]}, {"$unset": {"notes": ""}})
+        migrated += 1
+    
+    await db.migrations.update_one(
+        {"_id": NOTES_MIGRATION_ID},
+        {"$set": {"completed_at": datetime.now(timezone.utc).isoformat(), "users": migrated}},
+        upsert=True
+    )
+    print(f"✅ Migrated notes of {migrated} users to staff_notes")
+
+STRIKE_LEDGER_MIGRATION_ID = "strike_ledger"
+
+async def migrate_strike_ledger():
+    """Give migrated strike notes their active flag: a user's newest `strikes` strikes are active, the rest removed"""
+    if await db.migrations.find_one({"_id": STRIKE_LEDGER_MIGRATION_ID}) is not None:
+        return
+    
+    discord_ids = await db.staff_notes.distinct("discord_id", {"type": "strike", "active": {"$exists": False}})
+    for discord_id in discord_ids:
+        staff = await db.users.find_one({"discord_id": discord_id}, {"_id": 0, "strikes": 1})
+        active_count = (staff or {}).get("strikes", 0)
+        strikes = await db.staff_notes.find(
+            {"discord_id": discord_id, "type": "strike"},
+            {"_id": 0, "id": 1}
+        ).sort([("added_at", -1), ("id", -1)]).to_list(None)
+        strike_ids = [strike["id"] for strike in strikes]
+        await db.staff_notes.update_many({"id": {"$in": strike_ids[:active_count]}}, {"$set": {"active": True}})
+        await db.staff_notes.update_many({"id": {"$in": strike_ids[active_count:]}}, {"$set": {"active": False}})
+    
+    await db.migrations.update_one(
+        {"_id": STRIKE_LEDGER_MIGRATION_ID},
+        {"$set": {"completed_at": datetime.now(timezone.utc).isoformat(), "users": len(discord_ids)}},
+        upsert=True
+    )
+    print(f"✅ Set active strikes for {len(discord_ids)} users")
+
+STAFF_RANK_MIGRATION_ID = "staff_rank_default"
+
+async def migrate_missing_staff_ranks():
+    """Give team members added without a rank (while User.staff_rank had no default) the starting mod_elev rank"""
+    if await db.migrations.find_one({"_id": STAFF_RANK_MIGRATION_ID}) is not None:
+        return
+    
+    discord_ids = await db.users.distinct(
+        "discord_id",
+        {"discord_id": {"$in": await staff_team_member_ids()}, "staff_rank": None}
+    )
+    await db.users.update_many({"discord_id": {"$in": discord_ids}}, {"$set": {"staff_rank": "mod_elev"}})
+    for discord_id in discord_ids:
+        await invalidate_user_cache(discord_id)
+    
+    await db.migrations.update_one(
+        {"_id": STAFF_RANK_MIGRATION_ID},
+        {"$set": {"completed_at": datetime.now(timezone.utc).isoformat(), "users": len(discord_ids)}},
+        upsert=True
+    )
+    print(f"✅ Set the starting rank for {len(discord_ids)} team members without one")
+
+# Leader election
+# Exactly one worker holds the "leader" lease in `leases`: it owns the Discord gateway connection,
+# the scheduler and the periodic jobs. Every worker keeps serving HTTP and queues its Discord work
+# in the notification outbox, which the leader's bot delivers.
+LEADER_LEASE_SECONDS = int(os.environ.get('LEADER_LEASE_SECONDS', '30'))
+LEADER_RENEW_SECONDS = float(os.environ.get('LEADER_RENEW_SECONDS', '10'))
+
+class LeaderLease:
+    """Mongo-backed lease; the holder renews it, everyone else retries until it expires"""
+    def __init__(self, collection, name: str, on_elected, on_demoted):
+        self.collection = collection
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.is_leader = False
+        self._valid_until = 0.0  # monotonic; we stop acting as leader after this without a renewal
+
+    async def try_acquire(self) -> bool:
+        """Take the lease if it is free or expired, or renew it if we already hold it"""
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"holder": WORKER_ID}, {"expires_at": {"$lte": now}}]},
+                {"$set": {
+                    "holder": WORKER_ID,
+                    "expires_at": now + timedelta(seconds=LEADER_LEASE_SECONDS),
+                    "renewed_at": now
+                }},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Held by another worker: the upsert tried to insert a second lease document
+            return False
+        return True
+
+    async def step_down(self):
+        """Stop leading and free the lease so another worker takes over right away"""
+        await self._set_leader(False)
+        await self.collection.delete_one({"_id": self.name, "holder": WORKER_ID})
+
+    async def _set_leader(self, is_leader: bool):
+        if is_leader == self.is_leader:
+            return
+        if not is_leader:
+            self.is_leader = False
+            print(f"⬇️ No longer {self.name} ({WORKER_ID})")
+            await self.on_demoted()
+            return
+        
+        # Only count as leader once everything is running; a half-started leader would keep
+        # renewing the lease without doing the work, and nobody else could take over
+        try:
+            await self.on_elected()
+        except Exception as e:
+            print(f"❌ Failed to start as {self.name} ({WORKER_ID}), releasing the lease: {e}")
+            try:
+                await self.on_demoted()
+            finally:
+                await self.collection.delete_one({"_id": self.name, "holder": WORKER_ID})
+                self._valid_until = 0.0
+            return
+        self.is_leader = True
+        print(f"👑 Elected {self.name} ({WORKER_ID})")
+
+    async def run(self):
+        while True:
+            try:
+                acquired = await self.try_acquire()
+                if acquired:
+                    self._valid_until = time.monotonic() + LEADER_LEASE_SECONDS
+                await self._set_leader(acquired)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error renewing {self.name} lease: {e}")
+                # Mongo unreachable: keep leading only while our last lease is still valid
+                if time.monotonic() >= self._valid_until:
+                    await self._set_leader(False)
+            await asyncio.sleep(LEADER_RENEW_SECONDS)
+
+leader_tasks = []
+
+async def start_leader_tasks():
+    await init_discord_bot()
+    # Start the scheduler (probation upgrades)
+    await sync_probation_jobs()
+    leader_tasks.extend([
+        asyncio.create_task(job_scheduler.run()),
+        asyncio.create_task(reconcile_stats_periodically()),
+        asyncio.create_task(sync_staff_roles_periodically())
+    ])
+
+async def stop_leader_tasks():
+    for task in leader_tasks:
+        task.cancel()
+    leader_tasks.clear()
+    await stop_discord_bot()
+
+leader_lease = LeaderLease(db.leases, "leader", start_leader_tasks, stop_leader_tasks)
 
 @app.on_event("startup")
 async def startup_event():
-    await init_discord_bot()
-    # Start probation checker
-    asyncio.create_task(check_probation_periods())
+    await ensure_indexes()
+    await migrate_user_notes()
+    await migrate_strike_ledger()
+    await migrate_missing_staff_ranks()
+    await session_store.init()
+    asyncio.create_task(listen_user_invalidations())
+    fivem_client.start()
+    asyncio.create_task(fivem_players.poll())
+    # Outbox workers idle unless this worker's bot is connected, i.e. it is the leader
+    notification_outbox.start()
+    asyncio.create_task(leader_lease.run())
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if leader_lease.is_leader:
+        await leader_lease.step_down()
     client.close()
-    if discord_bot_client:
-        await discord_bot_client.close()
+    await fivem_client.close()
@@ -3,6 +3,117 @@
 
 local ADMIN_PANEL_URL = "https://api.redicate.dk/api"
 
+-- Admin actions, one per /admin/<action> endpoint (also used by /admin/batch)
+local AdminActions = {}
+
+AdminActions['kick'] = function(data)
+    local playerId = data.player_id
+    local reason = data.reason or "Kicked by admin"
+    local admin = data.admin or "Admin"
+    
+    if playerId then
+        DropPlayer(playerId, reason .. " (By: " .. admin .. ")")
+        print("[Admin] " .. admin .. " kicked player " .. GetPlayerName(playerId) .. ": " .. reason)
+        return {success = true}
+    else
+        return {success = false, error = "Invalid player ID"}
+    end
+end
+
+AdminActions['ban'] = function(data)
+    local playerId = data.player_id
+    local reason = data.reason or "Banned by admin"
+    local duration = data.duration or 0
+    local admin = data.admin or "Admin"
+    
+    if playerId then
+        -- Get player identifiers
+        local identifiers = GetPlayerIdentifiers(playerId)
+        local license = nil
+        for _, id in pairs(identifiers) do
+            if string.match(id, "license:") then
+                license = id
+                break
+            end
+        end
+        
+        -- Drop player
+        DropPlayer(playerId, "Du er blevet banned: " .. reason .. " (By: " .. admin .. ")")
+        
+        -- Save ban to file (you can also save to database)
+        local banData = {
+            license = license,
+            name = GetPlayerName(playerId),
+            reason = reason,
+            admin = admin,
+            duration = duration,
+            timestamp = os.time()
+        }
+        
+        -- TODO: Add to ban list/database
+        print("[Admin] " .. admin .. " banned player " .. GetPlayerName(playerId) .. ": " .. reason)
+        return {success = true}
+    else
+        return {success = false, error = "Invalid player ID"}
+    end
+end
+
+AdminActions['teleport'] = function(data)
+    local playerId = data.player_id
+    local coords = data.coordinates
+    
+    if playerId then
+        -- Send to client
+        TriggerClientEvent('redicate:teleport', playerId, coords)
+        print("[Admin] Teleporting player " .. GetPlayerName(playerId))
+        return {success = true}
+    else
+        return {success = false, error = "Invalid player ID"}
+    end
+end
+
+AdminActions['heal'] = function(data)
+    local playerId = data.player_id
+    
+    if playerId then
+        TriggerClientEvent('redicate:heal', playerId)
+        print("[Admin] Healing player " .. GetPlayerName(playerId))
+        return {success = true}
+    else
+        return {success = false, error = "Invalid player ID"}
+    end
+end
+
+AdminActions['announce'] = function(data)
+    local message = data.message
+    local admin = data.admin or "Admin"
+    
+    if message then
+        TriggerClientEvent('chat:addMessage', -1, {
+            color = {255, 0, 0},
+            multiline = true,
+            args = {"[ANNOUNCEMENT - " .. admin .. "]", message}
+        })
+        print("[Admin] " .. admin .. " sent announcement: " .. message)
+        return {success = true}
+    else
+        return {success = false, error = "No message provided"}
+    end
+end
+
+-- Run one action; errors are returned instead of breaking the HTTP response
+local function RunAdminAction(action, data)
+    local handler = AdminActions[action]
+    if not handler then
+        return {success = false, error = "Unknown action: " .. tostring(action)}
+    end
+    local ok, result = pcall(handler, data)
+    if not ok then
+        return {success = false, error = tostring(result)}
+    end
+    return result
+end
+
 -- HTTP endpoint to get players
 SetHttpHandler(function(req, res)
     if req.path == '/players.json' then
@@ -19,109 +130,22 @@ SetHttpHandler(function(req, res)
         return
     end
     
-    -- Admin actions
-    if req.path == '/admin/kick' and req.method == 'POST' then
+    -- Batch of actions in one request: {admin = "...", actions = {{action = "heal", player_id = 1}, ...}}
+    if req.path == '/admin/batch' and req.method == 'POST' then
         local data = json.decode(req.body)
-        local playerId = data.player_id
-        local reason = data.reason or "Kicked by admin"
-        local admin = data.admin or "Admin"
-        
-        if playerId then
-            DropPlayer(playerId, reason .. " (By: " .. admin .. ")")
-            print("[Admin] " .. admin .. " kicked player " .. GetPlayerName(playerId) .. ": " .. reason)
-            res.send(json.encode({success = true}))
-        else
-            res.send(json.encode({success = false, error = "Invalid player ID"}))
+        local results = {}
+        for i, item in ipairs(data.actions or {}) do
+            item.admin = item.admin or data.admin
+            results[i] = RunAdminAction(item.action, item)
         end
+        res.send(json.encode({success = true, results = results}))
         return
     end
     
-    if req.path == '/admin/ban' and req.method == 'POST' then
-        local data = json.decode(req.body)
-        local playerId = data.player_id
-        local reason = data.reason or "Banned by admin"
-        local duration = data.duration or 0
-        local admin = data.admin or "Admin"
-        
-        if playerId then
-            -- Get player identifiers
-            local identifiers = GetPlayerIdentifiers(playerId)
-            local license = nil
-            for _, id in pairs(identifiers) do
-                if string.match(id, "license:") then
-                    license = id
-                    break
-                end
-            end
-            
-            -- Drop player
-            DropPlayer(playerId, "Du er blevet banned: " .. reason .. " (By: " .. admin .. ")")
-            
-            -- Save ban to file (you can also save to database)
-            local banData = {
-                license = license,
-                name = GetPlayerName(playerId),
-                reason = reason,
-                admin = admin,
-                duration = duration,
-                timestamp = os.time()
-            }
-            
-            -- TODO: Add to ban list/database
-            print("[Admin] " .. admin .. " banned player " .. GetPlayerName(playerId) .. ": " .. reason)
-            res.send(json.encode({success = true}))
-        else
-            res.send(json.encode({success = false, error = "Invalid player ID"}))
-        end
-        return
-    end
-    
-    if req.path == '/admin/teleport' and req.method == 'POST' then
-        local data = json.decode(req.body)
-        local playerId = data.player_id
-        local coords = data.coordinates
-        
-        if playerId then
-            -- Send to client
-            TriggerClientEvent('redicate:teleport', playerId, coords)
-            print("[Admin] Teleporting player " .. GetPlayerName(playerId))
-            res.send(json.encode({success = true}))
-        else
-            res.send(json.encode({success = false, error = "Invalid player ID"}))
-        end
-        return
-    end
-    
-    if req.path == '/admin/heal' and req.method == 'POST' then
-        local data = json.decode(req.body)
-        local playerId = data.player_id
-        
-        if playerId then
-            TriggerClientEvent('redicate:heal', playerId)
-            print("[Admin] Healing player " .. GetPlayerName(playerId))
-            res.send(json.encode({success = true}))
-        else
-            res.send(json.encode({success = false, error = "Invalid player ID"}))
-        end
-        return
-    end
-    
-    if req.path == '/admin/announce' and req.method == 'POST' then
-        local data = json.decode(req.body)
-        local message = data.message
-        local admin = data.admin or "Admin"
-        
-        if message then
-            TriggerClientEvent('chat:addMessage', -1, {
-                color = {255, 0, 0},
-                multiline = true,
-                args = {"[ANNOUNCEMENT - " .. admin .. "]", message}
-            })
-            print("[Admin] " .. admin .. " sent announcement: " .. message)
-            res.send(json.encode({success = true}))
-        else
-            res.send(json.encode({success = false, error = "No message provided"}))
-        end
+    -- Single action
+    local action = req.method == 'POST' and string.match(req.path, '^/admin/([%w%-]+)$')
+    if action and AdminActions[action] then
+        res.send(json.encode(RunAdminAction(action, json.decode(req.body))))
         return
     end
     
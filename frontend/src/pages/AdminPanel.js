@@ -13,8 +13,12 @@ import { toast } from "sonner";
 const AdminPanel = () => {
   const { user } = useContext(AuthContext);
   const [applications, setApplications] = useState([]);
+  const [applicationsCursor, setApplicationsCursor] = useState(null);
+  const [loadingMoreApplications, setLoadingMoreApplications] = useState(false);
   const [applicationTypes, setApplicationTypes] = useState([]);
   const [reports, setReports] = useState([]);
+  const [reportsCursor, setReportsCursor] = useState(null);
+  const [loadingMoreReports, setLoadingMoreReports] = useState(false);
   const [stats, setStats] = useState(null);
   const [selectedApp, setSelectedApp] = useState(null);
   const [selectedReport, setSelectedReport] = useState(null);
@@ -40,15 +44,35 @@ const AdminPanel = () => {
     fetchStats();
   }, []);
 
-  const fetchApplications = async () => {
+  const fetchApplications = async (cursor = null) => {
     try {
-      const response = await axios.get(`${API}/applications`, { withCredentials: true });
-      setApplications(response.data);
+      const params = { status: "pending", view: "summary" };
+      const response = await axios.get(`${API}/applications`, {
+        params: cursor ? { ...params, cursor } : params,
+        withCredentials: true
+      });
+      setApplications((prev) => (cursor ? [...prev, ...response.data] : response.data));
+      setApplicationsCursor(response.headers["x-next-cursor"] || null);
     } catch (error) {
       console.error("Failed to fetch applications", error);
     }
   };
 
+  const loadMoreApplications = async () => {
+    setLoadingMoreApplications(true);
+    await fetchApplications(applicationsCursor);
+    setLoadingMoreApplications(false);
+  };
+
+  const openApplication = async (appId) => {
+    try {
+      const response = await axios.get(`${API}/applications/${appId}`, { withCredentials: true });
+      setSelectedApp(response.data);
+    } catch (error) {
+      toast.error("Kunne ikke hente ansøgning");
+    }
+  };
+
   const fetchApplicationTypes = async () => {
     try {
       const response = await axios.get(`${API}/application-types`);
@@ -58,15 +82,25 @@ const AdminPanel = () => {
     }
   };
 
-  const fetchReports = async () => {
+  const fetchReports = async (cursor = null) => {
     try {
-      const response = await axios.get(`${API}/reports`, { withCredentials: true });
-      setReports(response.data);
+      const response = await axios.get(`${API}/reports`, {
+        params: cursor ? { status: "pending", cursor } : { status: "pending" },
+        withCredentials: true
+      });
+      setReports((prev) => (cursor ? [...prev, ...response.data] : response.data));
+      setReportsCursor(response.headers["x-next-cursor"] || null);
     } catch (error) {
       console.error("Failed to fetch reports", error);
     }
   };
 
+  const loadMoreReports = async () => {
+    setLoadingMoreReports(true);
+    await fetchReports(reportsCursor);
+    setLoadingMoreReports(false);
+  };
+
   const fetchStats = async () => {
     try {
       const response = await axios.get(`${API}/stats`, { withCredentials: true });
@@ -260,7 +294,7 @@ const AdminPanel = () => {
                       <Button 
                         variant="outline" 
                         className="border-[#4A90E2] text-[#4A90E2] hover:bg-[#4A90E2]/10"
-                        onClick={() => setSelectedApp(app)}
+                        onClick={() => openApplication(app.id)}
                         data-testid={`view-app-${app.id}`}
                       >
                         Se Detaljer
@@ -322,6 +356,16 @@ const AdminPanel = () => {
                 </div>
               ))
             )}
+            {applicationsCursor && (
+              <Button
+                onClick={loadMoreApplications}
+                disabled={loadingMoreApplications}
+                className="w-full bg-[#4A90E2] hover:bg-[#4A90E2]/80"
+                data-testid="load-more-applications"
+              >
+                {loadingMoreApplications ? "Indlæser..." : "Vis flere ansøgninger"}
+              </Button>
+            )}
           </TabsContent>
 
           <TabsContent value="reports" className="space-y-4" data-testid="reports-content">
@@ -414,6 +458,16 @@ const AdminPanel = () => {
                 </div>
               ))
             )}
+            {reportsCursor && (
+              <Button
+                onClick={loadMoreReports}
+                disabled={loadingMoreReports}
+                className="w-full bg-[#4A90E2] hover:bg-[#4A90E2]/80"
+                data-testid="load-more-reports"
+              >
+                {loadingMoreReports ? "Indlæser..." : "Vis flere rapporter"}
+              </Button>
+            )}
           </TabsContent>
 
           <TabsContent value="types" className="space-y-4" data-testid="types-content">
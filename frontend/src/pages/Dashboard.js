@@ -29,7 +29,10 @@ const Dashboard = () => {
 
   const fetchMyApplications = async () => {
     try {
-      const response = await axios.get(`${API}/applications`, { withCredentials: true });
+      const response = await axios.get(`${API}/applications`, {
+        params: { user_id: user?.discord_id, view: "summary" },
+        withCredentials: true
+      });
       setMyApplications(response.data);
     } catch (error) {
       console.error("Failed to fetch applications", error);
@@ -25,18 +25,47 @@ const FiveMPanel = () => {
   useEffect(() => {
     fetchPlayers();
     fetchServerStats();
-    const interval = setInterval(() => {
-      fetchPlayers();
-      fetchServerStats();
-    }, 5000);
-    return () => clearInterval(interval);
+    const interval = setInterval(fetchServerStats, 5000);
+
+    // Live player feed: a full snapshot first, then joins/leaves/ping changes
+    let playersInterval = null;
+    const feed = new EventSource(`${API}/fivem/players/stream`, { withCredentials: true });
+    feed.addEventListener("snapshot", (event) => applyPlayers(JSON.parse(event.data)));
+    feed.addEventListener("diff", (event) => {
+      const diff = JSON.parse(event.data);
+      setPlayers(prev => {
+        const updates = Object.fromEntries(diff.updated.map(p => [p.id, p]));
+        const next = prev
+          .filter(p => !diff.left.includes(p.id))
+          .map(p => (updates[p.id] ? { ...p, ...updates[p.id] } : p))
+          .concat(diff.joined);
+        setServerStats(stats => ({ ...stats, online: next.length }));
+        return next;
+      });
+    });
+    feed.onerror = () => {
+      // Fall back to polling if the feed is unavailable
+      if (feed.readyState === EventSource.CLOSED && !playersInterval) {
+        playersInterval = setInterval(fetchPlayers, 5000);
+      }
+    };
+
+    return () => {
+      clearInterval(interval);
+      clearInterval(playersInterval);
+      feed.close();
+    };
   }, []);
 
+  const applyPlayers = (list) => {
+    setPlayers(list || []);
+    setServerStats(prev => ({ ...prev, online: list?.length || 0 }));
+  };
+
   const fetchPlayers = async () => {
     try {
       const response = await axios.get(`${API}/fivem/players`);
-      setPlayers(response.data.players || []);
-      setServerStats(prev => ({ ...prev, online: response.data.players?.length || 0 }));
+      applyPlayers(response.data.players);
     } catch (error) {
       console.error("Failed to fetch players", error);
     }
@@ -22,6 +22,8 @@ const HeadAdminPanel = () => {
   const [strikeReason, setStrikeReason] = useState("");
   const [note, setNote] = useState("");
   const [newRank, setNewRank] = useState("");
+  const [memberNotes, setMemberNotes] = useState([]);
+  const [notesCursor, setNotesCursor] = useState(null);
 
   useEffect(() => {
     fetchMyTeam();
@@ -42,6 +44,28 @@ const HeadAdminPanel = () => {
     }
   };
 
+  const fetchMemberNotes = async (memberId, cursor = null) => {
+    try {
+      const response = await axios.get(`${API}/staff/members/${memberId}/notes`, {
+        params: { limit: 20, ...(cursor && { cursor }) },
+        withCredentials: true
+      });
+      setMemberNotes((prev) => (cursor ? [...prev, ...response.data] : response.data));
+      setNotesCursor(response.headers["x-next-cursor"] || null);
+    } catch (error) {
+      console.error("Failed to fetch notes", error);
+    }
+  };
+
+  const openMember = (member) => {
+    setSelectedMember(member);
+    setMemberNotes([]);
+    setNotesCursor(null);
+    if (member.notes_count > 0) {
+      fetchMemberNotes(member.discord_id);
+    }
+  };
+
   const handleAddStrike = async (memberId) => {
     if (!strikeReason.trim()) {
       toast.error("Indtast en årsag for strike");
@@ -105,6 +129,8 @@ const HeadAdminPanel = () => {
       
       if (response.data.discord_updated) {
         toast.success(`${selectedMember.username} upranket! Discord roller opdateret.`);
+      } else if (response.data.discord_queued) {
+        toast.success(`${selectedMember.username} upranket! Discord roller opdateres om lidt.`);
       } else {
         toast.warning(`${selectedMember.username} upranket i database, men Discord rolle opdatering fejlede.`);
       }
@@ -315,9 +341,9 @@ const HeadAdminPanel = () => {
                           {member.strikes || 0}/3
                         </span>
                       </div>
-                      {member.notes && member.notes.length > 0 && (
+                      {member.notes_count > 0 && (
                         <div className="text-xs text-gray-500">
-                          {member.notes.length} note(r)
+                          {member.notes_count} note(r)
                         </div>
                       )}
                     </div>
@@ -325,7 +351,7 @@ const HeadAdminPanel = () => {
                     <Dialog>
                       <DialogTrigger asChild>
                         <Button
-                          onClick={() => setSelectedMember(member)}
+                          onClick={() => openMember(member)}
                           className="w-full bg-[#4A90E2] hover:bg-[#4A90E2]/80 mb-2"
                         >
                           Administrér
@@ -361,18 +387,27 @@ const HeadAdminPanel = () => {
                             </div>
 
                             {/* Notes History */}
-                            {selectedMember.notes && selectedMember.notes.length > 0 && (
+                            {memberNotes.length > 0 && (
                               <div>
                                 <h3 className="text-lg font-semibold text-white mb-3">📝 Noter Historie</h3>
                                 <div className="space-y-2 max-h-48 overflow-y-auto">
-                                  {selectedMember.notes.map((note, idx) => (
-                                    <div key={idx} className="bg-[#0a0a0b] p-3 rounded text-sm">
-                                      <p className="text-gray-300">{note.text}</p>
+                                  {memberNotes.map((note) => (
+                                    <div key={note.id} className="bg-[#0a0a0b] p-3 rounded text-sm">
+                                      <p className={note.active === false ? "text-gray-500 line-through" : "text-gray-300"}>{note.text}</p>
                                       <p className="text-xs text-gray-500 mt-1">
                                         {note.added_by} - {new Date(note.added_at).toLocaleDateString('da-DK')}
                                       </p>
                                     </div>
                                   ))}
+                                  {notesCursor && (
+                                    <Button
+                                      onClick={() => fetchMemberNotes(selectedMember.discord_id, notesCursor)}
+                                      variant="ghost"
+                                      className="w-full text-gray-400 hover:text-white"
+                                    >
+                                      Vis flere
+                                    </Button>
+                                  )}
                                 </div>
                               </div>
                             )}
@@ -18,16 +18,22 @@ const MyReports = () => {
   const [selectedStatus, setSelectedStatus] = useState("");
   const [punishmentType, setPunishmentType] = useState("");
   const [punishmentDuration, setPunishmentDuration] = useState("");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
     fetchMyReports();
   }, []);
 
-  const fetchMyReports = async () => {
+  const fetchMyReports = async (cursor = null) => {
     try {
-      const response = await axios.get(`${API}/reports`, { withCredentials: true });
-      setReports(response.data);
+      const response = await axios.get(`${API}/reports`, {
+        params: cursor ? { cursor } : {},
+        withCredentials: true
+      });
+      setReports((prev) => (cursor ? [...prev, ...response.data] : response.data));
+      setNextCursor(response.headers["x-next-cursor"] || null);
     } catch (error) {
       console.error("Failed to fetch reports", error);
     } finally {
@@ -35,6 +41,12 @@ const MyReports = () => {
     }
   };
 
+  const loadMoreReports = async () => {
+    setLoadingMore(true);
+    await fetchMyReports(nextCursor);
+    setLoadingMore(false);
+  };
+
   const getStatusColor = (status) => {
     switch (status) {
       case "resolved": return "text-green-500";
@@ -363,6 +375,16 @@ const MyReports = () => {
                 </div>
               </div>
             ))}
+            {nextCursor && (
+              <Button
+                onClick={loadMoreReports}
+                disabled={loadingMore}
+                className="w-full bg-[#4A90E2] hover:bg-[#4A90E2]/80"
+                data-testid="load-more-reports"
+              >
+                {loadingMore ? "Indlæser..." : "Vis flere rapporter"}
+              </Button>
+            )}
           </div>
         )}
       </div>
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+# server.py reads these at import time; the database itself is replaced by mongomock below
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("SESSION_BACKEND", "memory")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+import server
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def db(monkeypatch):
+    """A fresh in-memory database for every test, wired into every object that holds a collection"""
+    test_db = AsyncMongoMockClient()["test"]
+    monkeypatch.setattr(server, "db", test_db)
+    monkeypatch.setattr(server.notification_outbox, "collection", test_db.notification_outbox)
+    monkeypatch.setattr(server.job_scheduler, "collection", test_db.scheduled_jobs)
+    monkeypatch.setattr(server.leader_lease, "collection", test_db.leases)
+    server.user_cache.clear()
+    return test_db
+
+
+@pytest.fixture
+def login(db):
+    """login(**user_fields) stores the user, opens a session and returns a TestClient using it"""
+    async def _login(**user_fields):
+        user = server.User(**user_fields)
+        await db.users.insert_one(user.model_dump())
+        token = f"test-{user.discord_id}"
+        await server.session_store.set(token, user.discord_id)
+        return TestClient(server.app, cookies={"session_token": token})
+    return _login
@@ -0,0 +1,73 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+ADMIN = server.User(discord_id="1", username="admin", is_admin=True)
+
+
+@pytest.fixture
+def bridge(monkeypatch):
+    """Fake FiveM bridge: set bridge.batch_response, read bridge.calls"""
+    class Bridge:
+        def __init__(self):
+            self.calls = []
+            self.batch_response = None
+
+        async def post(self, path, json):
+            self.calls.append(path)
+            if path == "/admin/batch":
+                return self.batch_response
+            return httpx.Response(200, json={"success": True})
+
+    fake = Bridge()
+    monkeypatch.setattr(server.fivem_client, "post", fake.post)
+    return fake
+
+
+def batch(*actions):
+    return server.FiveMBatchRequest(actions=[{"action": action, "player_id": 1, "amount": 100} for action in actions])
+
+
+async def test_batch_results_are_returned_per_action(bridge):
+    bridge.batch_response = httpx.Response(200, json={"success": True, "results": [{"success": True}, {"success": False, "error": "offline"}]})
+
+    result = await server.run_fivem_batch(batch("heal", "give-money"), ADMIN)
+
+    assert bridge.calls == ["/admin/batch"]
+    assert result["success"] is False
+    assert result["results"][1] == {"action": "give-money", "player_id": 1, "success": False, "error": "offline"}
+
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(404, text="Not found"),
+    httpx.Response(200, text="Redicate Admin Panel - ESX Resource Running"),
+])
+async def test_bridge_without_batch_handler_gets_single_actions(bridge, response):
+    bridge.batch_response = response
+
+    result = await server.run_fivem_batch(batch("heal", "give-money"), ADMIN)
+
+    assert bridge.calls == ["/admin/batch", "/admin/heal", "/admin/give-money"]
+    assert result["success"] is True
+
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(200, json={"success": True}),
+    httpx.Response(200, json={"success": True, "results": [{"success": True}]}),
+    httpx.Response(200, json=[{"success": True}, {"success": True}]),
+    httpx.Response(200, json="ok"),
+    httpx.Response(200, text="<html>proxy error</html>"),
+    httpx.Response(500, text="Internal error"),
+])
+async def test_bad_batch_reply_fails_without_resending(bridge, response):
+    bridge.batch_response = response
+
+    with pytest.raises(HTTPException) as error:
+        await server.run_fivem_batch(batch("give-money", "give-item"), ADMIN)
+
+    assert error.value.status_code == 502
+    assert bridge.calls == ["/admin/batch"]
@@ -0,0 +1,86 @@
+import time
+
+import httpx
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def game_server(monkeypatch):
+    """Fake players.json: set game_server.fail, read game_server.calls"""
+    class GameServer:
+        def __init__(self):
+            self.calls = 0
+            self.fail = False
+
+        async def get(self, path):
+            self.calls += 1
+            if self.fail:
+                raise httpx.ConnectTimeout("timed out")
+            return httpx.Response(200, json=[{"id": 1, "name": "player"}])
+
+    fake = GameServer()
+    monkeypatch.setattr(server.fivem_client, "get", fake.get)
+    monkeypatch.setattr(server, "record_fivem_poll", lambda ok: None)
+    return fake
+
+
+async def test_failing_server_does_not_block_requests(game_server):
+    snapshot = server.FiveMPlayerSnapshot()
+    await snapshot.get()
+    snapshot.fetched_at -= server.FIVEM_PLAYERS_POLL_INTERVAL_SECONDS
+    game_server.fail = True
+
+    # The first stale read waits for the refresh; it fails and the last players are kept
+    assert await snapshot.get() == [{"id": 1, "name": "player"}]
+    assert game_server.calls == 2 and snapshot.failed_at is not None
+
+    # Until a poll interval has passed, reads answer at once without asking the game server
+    assert await snapshot.get() == [{"id": 1, "name": "player"}]
+    assert game_server.calls == 2
+
+    # After that a read retries in the background and still answers with the stale players
+    snapshot.failed_at = time.monotonic() - server.FIVEM_PLAYERS_POLL_INTERVAL_SECONDS
+    game_server.fail = False
+    assert await snapshot.get() == [{"id": 1, "name": "player"}]
+    await snapshot._refresh_task
+    assert game_server.calls == 3 and snapshot.failed_at is None and snapshot.is_fresh()
+
+
+def test_max_clients_falls_back_past_bad_values():
+    assert server.parse_max_clients("48", "64") == 48
+    assert server.parse_max_clients("", "32") == 32
+    assert server.parse_max_clients("lots", None) == 64
+    assert server.parse_max_clients(-1, {"sv": 1}) == 64
+
+
+async def test_non_object_json_is_not_cached(game_server, monkeypatch):
+    async def get(path):
+        return httpx.Response(200, json=["not", "an", "object"])
+
+    monkeypatch.setattr(server.fivem_client, "get", get)
+    cached = server.CachedFiveMJson("/dynamic.json", 10)
+
+    assert await cached.get() is None
+    assert cached.fetched_at is None
+
+
+async def test_stream_subscribes_only_while_it_is_being_read(game_server, monkeypatch):
+    class Request:
+        async def is_disconnected(self):
+            return False
+
+    snapshot = server.FiveMPlayerSnapshot()
+    monkeypatch.setattr(server, "fivem_players", snapshot)
+
+    response = await server.stream_fivem_players(Request(), None)
+    assert not snapshot._subscribers
+
+    body = response.body_iterator
+    assert (await body.__anext__()).startswith("event: snapshot")
+    assert len(snapshot._subscribers) == 1
+    await body.aclose()
+    assert not snapshot._subscribers
@@ -0,0 +1,51 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+class Callbacks:
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.events = []
+
+    async def on_elected(self):
+        self.events.append("elected")
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("bot login failed")
+
+    async def on_demoted(self):
+        self.events.append("demoted")
+
+
+async def test_lease_held_by_another_worker_is_not_taken(db):
+    callbacks = Callbacks()
+    lease = server.LeaderLease(db.leases, "leader", callbacks.on_elected, callbacks.on_demoted)
+    expires_at = server.datetime.now(server.timezone.utc) + server.timedelta(seconds=60)
+    await db.leases.insert_one({"_id": "leader", "holder": "other-host:1", "expires_at": expires_at})
+
+    assert await lease.try_acquire() is False
+
+    await db.leases.update_one({"_id": "leader"}, {"$set": {"expires_at": server.datetime.now(server.timezone.utc)}})
+    assert await lease.try_acquire() is True
+    await lease._set_leader(True)
+    assert lease.is_leader and callbacks.events == ["elected"]
+
+
+async def test_failed_start_releases_the_lease_and_retries(db):
+    callbacks = Callbacks(fail_times=1)
+    lease = server.LeaderLease(db.leases, "leader", callbacks.on_elected, callbacks.on_demoted)
+
+    assert await lease.try_acquire() is True
+    await lease._set_leader(True)
+
+    assert lease.is_leader is False
+    assert callbacks.events == ["elected", "demoted"]
+    assert await db.leases.count_documents({}) == 0
+
+    # The next renewal round tries again
+    assert await lease.try_acquire() is True
+    await lease._set_leader(True)
+    assert lease.is_leader is True
@@ -0,0 +1,78 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+LEGACY_NOTES = [
+    {"text": "⚠️ Strike 1/3: late", "added_by": "head", "added_at": "2024-01-01T00:00:00+00:00"},
+    {"text": "⚠️ Strike 2/3: rude", "added_by": "head", "added_at": "2024-01-02T00:00:00+00:00"},
+    {"text": "✅ Strike fjernet af Super Admin (strikes: 2 → 1)", "added_by": "super", "added_at": "2024-01-03T00:00:00+00:00"},
+    {"text": "🎉 Upranket fra mod_elev til moderator", "added_by": "head", "added_at": "2024-01-04T00:00:00+00:00"},
+    {"text": "Strike talk in a normal note", "added_by": "head", "added_at": "2024-01-05T00:00:00+00:00"},
+]
+
+
+async def test_notes_move_to_typed_staff_notes(db):
+    await db.users.insert_one({"discord_id": "7", "username": "staff", "strikes": 1, "notes": LEGACY_NOTES})
+
+    await server.migrate_user_notes()
+
+    notes = await db.staff_notes.find({"discord_id": "7"}, {"_id": 0}).sort("added_at", 1).to_list(None)
+    assert [note["type"] for note in notes] == ["strike", "strike", "strike_removed", "uprank", "note"]
+    assert notes[0]["strike_number"] == 1 and notes[0]["reason"] == "late"
+    assert notes[1]["strike_number"] == 2 and notes[1]["reason"] == "rude"
+    assert notes[2]["strike_number"] == 1
+    assert (notes[3]["old_rank"], notes[3]["new_rank"]) == ("mod_elev", "moderator")
+    assert "notes" not in await db.users.find_one({"discord_id": "7"})
+
+
+async def test_notes_migration_is_idempotent(db):
+    await server.ensure_indexes()
+    await db.users.insert_one({"discord_id": "7", "username": "staff", "notes": LEGACY_NOTES})
+    await server.migrate_user_notes()
+
+    # A worker that died before unsetting users.notes runs the migration again
+    await db.migrations.delete_many({})
+    await db.users.update_one({"discord_id": "7"}, {"$set": {"notes": LEGACY_NOTES}})
+    await server.migrate_user_notes()
+    await server.migrate_user_notes()
+
+    assert await db.staff_notes.count_documents({}) == len(LEGACY_NOTES)
+    assert "notes" not in await db.users.find_one({"discord_id": "7"})
+
+
+async def test_strike_ledger_marks_the_newest_strikes_active(db):
+    await db.users.insert_one({"discord_id": "7", "username": "staff", "strikes": 1, "notes": LEGACY_NOTES})
+    await server.migrate_user_notes()
+
+    await server.migrate_strike_ledger()
+
+    strikes = await db.staff_notes.find({"type": "strike"}, {"_id": 0}).sort("added_at", 1).to_list(None)
+    assert [(strike["reason"], strike["active"]) for strike in strikes] == [("late", False), ("rude", True)]
+
+
+async def test_strike_ledger_migration_runs_once(db):
+    await db.users.insert_one({"discord_id": "7", "username": "staff", "strikes": 2, "notes": LEGACY_NOTES})
+    await server.migrate_user_notes()
+    await server.migrate_strike_ledger()
+    await server.revoke_strike("7", "super")
+
+    await server.migrate_strike_ledger()
+
+    assert await db.staff_notes.count_documents({"type": "strike", "active": True}) == 1
+
+
+async def test_team_members_without_a_rank_get_mod_elev(db):
+    await db.users.insert_many([
+        {"discord_id": "1", "username": "added", "staff_rank": None},
+        {"discord_id": "2", "username": "upranked", "staff_rank": "moderator"},
+        {"discord_id": "3", "username": "admin", "staff_rank": None},
+    ])
+    await db.staff_teams.insert_one({"id": "t", "members": ["1", "2"]})
+
+    await server.migrate_missing_staff_ranks()
+
+    ranks = {user["discord_id"]: user["staff_rank"] for user in await db.users.find().to_list(None)}
+    assert ranks == {"1": "mod_elev", "2": "moderator", "3": None}
+    assert await db.migrations.find_one({"_id": server.STAFF_RANK_MIGRATION_ID}) is not None
@@ -0,0 +1,42 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def head_admin(db, login):
+    client = await login(discord_id="1", username="head", is_head_admin=True, role="head_admin")
+    await db.users.insert_one({
+        "discord_id": "7", "username": "staff", "avatar": "abc", "role": "staff_member",
+        "staff_rank": "mod_elev", "strikes": 0, "on_probation": False, "created_at": "2024-01-01T00:00:00+00:00"
+    })
+    await db.staff_teams.insert_one({"id": "t", "name": "Team", "description": "", "head_admin_id": "1", "members": ["7"]})
+    return client
+
+
+async def test_unchanged_team_answers_304(head_admin):
+    response = head_admin.get("/api/staff/my-team")
+    assert response.status_code == 200
+    assert response.json()["members"] == [{
+        "discord_id": "7", "username": "staff", "avatar": "abc", "staff_rank": "mod_elev",
+        "strikes": 0, "on_probation": False, "notes_count": 0
+    }]
+
+    cached = head_admin.get("/api/staff/my-team", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == response.headers["etag"]
+
+
+@pytest.mark.parametrize("write", [
+    lambda client: client.post("/api/staff/my-team/members/7/note", json={"note": "good job"}),
+    lambda client: client.post("/api/staff/my-team/members/7/strike", json={"reason": "late"}),
+])
+async def test_member_write_changes_the_etag(head_admin, write):
+    etag = head_admin.get("/api/staff/my-team").headers["etag"]
+
+    assert write(head_admin).status_code == 200
+
+    response = head_admin.get("/api/staff/my-team", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
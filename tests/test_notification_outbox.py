@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_coalesced_jobs_keep_the_latest_args(db):
+    outbox = server.notification_outbox
+    await outbox.enqueue("report_status", "dm:1", {"new_status": "investigating"}, coalesce_key="report_status:r")
+    await outbox.enqueue("report_status", "dm:1", {"new_status": "resolved"}, coalesce_key="report_status:r")
+
+    jobs = await db.notification_outbox.find({}).to_list(None)
+    assert len(jobs) == 1 and jobs[0]["args"] == {"new_status": "resolved"}
+
+
+async def test_concurrent_coalesced_insert_is_retried_as_an_update(db, monkeypatch):
+    await server.ensure_indexes()
+    outbox = server.notification_outbox
+    update_one = outbox.collection.update_one
+    calls = []
+
+    async def racing_update_one(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            # Another request inserts the pending job between our match and our insert
+            await db.notification_outbox.insert_one({
+                "kind": "report_status", "route": "dm:1", "status": "pending",
+                "coalesce_key": "report_status:r", "args": {"new_status": "investigating"}
+            })
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return await update_one(*args, **kwargs)
+
+    monkeypatch.setattr(outbox.collection, "update_one", racing_update_one)
+    await outbox.enqueue("report_status", "dm:1", {"new_status": "resolved"}, coalesce_key="report_status:r")
+
+    jobs = await db.notification_outbox.find({}).to_list(None)
+    assert len(calls) == 2
+    assert len(jobs) == 1 and jobs[0]["args"] == {"new_status": "resolved"}
+
+
+
+async def test_failed_job_is_superseded_by_a_newer_coalesced_job(db, monkeypatch):
+    await server.ensure_indexes()
+    outbox = server.notification_outbox
+    await outbox.enqueue("report_status", "dm:1", {"new_status": "investigating"}, coalesce_key="report_status:r")
+    await db.notification_outbox.update_many({}, {"$set": {"next_attempt_at": datetime.now(timezone.utc)}})
+    job = await outbox._claim()
+
+    async def failing_handler(**args):
+        # A newer update is queued while this one is being sent
+        await outbox.enqueue("report_status", "dm:1", {"new_status": "resolved"}, coalesce_key="report_status:r")
+        raise RuntimeError("Discord is down")
+
+    monkeypatch.setitem(outbox.handlers, "report_status", failing_handler)
+    await outbox._deliver(job)
+
+    stale = await db.notification_outbox.find_one({"_id": job["_id"]})
+    assert stale["status"] == "superseded" and stale["locked_until"] is None
+    pending = await db.notification_outbox.find({"status": "pending"}).to_list(None)
+    assert len(pending) == 1 and pending[0]["args"] == {"new_status": "resolved"}
+
+async def test_unique_index_rejects_a_second_pending_job(db):
+    await server.ensure_indexes()
+    await db.notification_outbox.insert_one({"coalesce_key": "k", "status": "pending"})
+    await db.notification_outbox.insert_one({"coalesce_key": "k", "status": "sent"})
+
+    with pytest.raises(DuplicateKeyError):
+        await db.notification_outbox.insert_one({"coalesce_key": "k", "status": "pending"})
@@ -0,0 +1,24 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def report(report_id, submitted_at):
+    return {
+        "id": report_id, "reporter_id": "1", "reporter_username": "reporter", "reported_player": "griefer",
+        "report_type": "player", "description": "", "status": "pending", "submitted_at": submitted_at
+    }
+
+
+async def test_date_only_date_to_includes_the_whole_day(db, login):
+    client = await login(discord_id="1", username="reporter")
+    await db.reports.insert_many([
+        report("a", "2024-05-01T23:59:00+00:00"),
+        report("b", "2024-05-02T00:00:00+00:00"),
+    ])
+
+    response = client.get("/api/reports", params={"date_to": "2024-05-01", "view": "summary"})
+    assert [report["id"] for report in response.json()] == ["a"]
+
+    response = client.get("/api/reports", params={"date_to": "2024-05-01T12:00:00", "view": "summary"})
+    assert response.json() == []
@@ -0,0 +1,130 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+PROBATION, PERM, MOD_ELEV, MODERATOR, UNRELATED = 10, 20, 30, 40, 99
+
+
+class FakeRole:
+    def __init__(self, role_id):
+        self.id = role_id
+
+    def is_default(self):
+        return False
+
+
+class FakeMember:
+    def __init__(self, member_id, role_ids):
+        self.id = member_id
+        self.roles = [FakeRole(role_id) for role_id in role_ids]
+        self.edits = []
+
+    async def edit(self, roles):
+        self.edits.append({role.id for role in roles})
+        self.roles = [FakeRole(role.id) for role in roles]
+
+
+class FakeGuild:
+    def __init__(self, members):
+        self.members = members
+        self.roles = [FakeRole(role_id) for role_id in (PROBATION, PERM, MOD_ELEV, MODERATOR, UNRELATED)]
+
+
+@pytest.fixture
+def guild(monkeypatch):
+    """Role ids, a bot whose guild holds the given FakeMembers, and per-member lookups against it"""
+    monkeypatch.setattr(server, "DISCORD_GUILD_ID", "1")
+    monkeypatch.setattr(server, "DISCORD_PROBATION_ROLE_ID", str(PROBATION))
+    monkeypatch.setattr(server, "DISCORD_PERM_STAFF_ROLE_ID", str(PERM))
+    monkeypatch.setattr(server, "DISCORD_MEMBERS_INTENT", False)
+    monkeypatch.setitem(server.RANK_TO_ROLE_ID, "mod_elev", str(MOD_ELEV))
+    monkeypatch.setitem(server.RANK_TO_ROLE_ID, "moderator", str(MODERATOR))
+    fake_guild = FakeGuild({})
+
+    class Bot:
+        def get_guild(self, guild_id):
+            return fake_guild
+
+    async def get_member(guild, member_id):
+        return fake_guild.members[member_id]
+
+    monkeypatch.setattr(server, "discord_bot_client", Bot())
+    monkeypatch.setattr(server.discord_entities, "get_member", get_member)
+    return fake_guild
+
+
+async def test_targets_follow_probation_and_rank(guild):
+    assert server.staff_role_targets({"on_probation": True, "staff_rank": "mod_elev"}) == {PROBATION}
+    assert server.staff_role_targets({"on_probation": False, "staff_rank": "moderator"}) == {PERM, MODERATOR}
+
+
+async def test_team_sync_uses_team_membership_not_user_role(db, guild):
+    # role is rewritten from Discord at login, so team members may be "player" or "head_admin"
+    await db.users.insert_many([
+        {"discord_id": "1", "role": "player", "on_probation": True, "staff_rank": "mod_elev"},
+        {"discord_id": "2", "role": "head_admin", "on_probation": False, "staff_rank": "moderator"},
+    ])
+    await db.staff_teams.insert_one({"id": "t", "members": ["1", "2"]})
+    guild.members = {1: FakeMember(1, [PROBATION, UNRELATED]), 2: FakeMember(2, [PERM, MOD_ELEV])}
+
+    result = await server.reconcile_staff_roles("t")
+
+    assert result["checked"] == 2
+    assert result["in_sync"] == 1
+    assert guild.members[1].edits == []
+    assert guild.members[2].edits == [{PERM, MODERATOR}]
+    report = await db.stats.find_one({"_id": server.role_sync_report_id("t")})
+    assert report["corrected"] == 1
+
+
+async def test_sync_endpoint_queues_the_run_for_the_leader(db, login):
+    client = await login(discord_id="9", username="super", role="super_admin")
+    await db.staff_teams.insert_one({"id": "t", "members": []})
+
+    response = client.post("/api/super-admin/staff/sync-roles?team_id=t")
+    response_again = client.post("/api/super-admin/staff/sync-roles?team_id=t")
+
+    assert response.status_code == 200 and response_again.status_code == 200
+    jobs = await db.notification_outbox.find({"kind": "role_sync"}).to_list(None)
+    assert len(jobs) == 1 and jobs[0]["args"] == {"team_id": "t"}
+    assert client.get("/api/super-admin/staff/sync-roles?team_id=t").json() == {"queued": True}
+    assert client.post("/api/super-admin/staff/sync-roles?team_id=missing").status_code == 404
+
+
+async def test_members_without_a_rank_are_left_alone(db, guild):
+    assert server.staff_role_targets({"on_probation": False, "staff_rank": None}) is None
+    await db.users.insert_one({"discord_id": "3", "on_probation": False, "staff_rank": None})
+    await db.staff_teams.insert_one({"id": "t", "members": ["3"]})
+    guild.members = {3: FakeMember(3, [PERM, MODERATOR])}
+
+    result = await server.reconcile_staff_roles("t")
+
+    assert result["no_rank"] == 1 and result["drifted"] == 0
+    assert guild.members[3].edits == []
+
+
+async def test_report_only_run_changes_nothing(db, guild):
+    await db.users.insert_one({"discord_id": "4", "on_probation": False, "staff_rank": "moderator"})
+    await db.staff_teams.insert_one({"id": "t", "members": ["4"]})
+    guild.members = {4: FakeMember(4, [MOD_ELEV])}
+
+    result = await server.reconcile_staff_roles(apply=False)
+
+    assert result["applied"] is False and result["corrected"] == 0
+    assert result["drift"] == [{"discord_id": "4", "missing_role_ids": [str(PERM), str(MODERATOR)], "extra_role_ids": [str(MOD_ELEV)]}]
+    assert guild.members[4].edits == []
+
+
+async def test_added_staff_members_start_at_mod_elev(db, login):
+    client = await login(discord_id="9", username="admin", is_admin=True)
+    await db.users.insert_one({"discord_id": "5", "username": "existing", "staff_rank": None})
+    await db.staff_teams.insert_one({"id": "t", "name": "Team", "head_admin_id": "1", "members": []})
+
+    for discord_id, username in (("5", "existing"), ("6", "new")):
+        response = client.post("/api/super-admin/staff/add", json={"discord_id": discord_id, "username": username, "team_id": "t"})
+        assert response.status_code == 200
+
+    users = await db.users.find({"discord_id": {"$in": ["5", "6"]}}).to_list(None)
+    assert [user["staff_rank"] for user in users] == ["mod_elev", "mod_elev"]
@@ -0,0 +1,63 @@
+import pytest
+from fastapi import HTTPException
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def active_strikes(db, discord_id):
+    return await db.staff_notes.count_documents({"discord_id": discord_id, "type": "strike", "active": True})
+
+
+async def test_record_and_revoke_keep_count_and_ledger_in_step(db):
+    await db.users.insert_one({"discord_id": "7", "username": "staff", "strikes": 0})
+
+    for reason in ("late", "rude", "afk"):
+        result = await server.record_strike("7", reason, "head")
+    assert result["strikes"] == 3 and result["strike"]["strike_number"] == 3
+    assert await active_strikes(db, "7") == 3
+
+    assert await server.revoke_strike("7", "super") == {"strikes": 2}
+
+    user = await db.users.find_one({"discord_id": "7"})
+    assert user["strikes"] == 2 and await active_strikes(db, "7") == 2
+    removed = await db.staff_notes.find_one({"type": "strike", "active": False})
+    assert removed["reason"] == "afk" and removed["removed_by"] == "super"
+    note = await db.staff_notes.find_one({"type": "strike_removed"})
+    assert note["strike_id"] == removed["id"] and note["strike_number"] == 2
+
+
+async def test_revoke_without_strikes_fails(db):
+    await db.users.insert_one({"discord_id": "8", "username": "clean", "strikes": 0})
+
+    with pytest.raises(HTTPException) as error:
+        await server.revoke_strike("8", "super")
+    assert error.value.status_code == 400
+
+    with pytest.raises(HTTPException) as error:
+        await server.revoke_strike("missing", "super")
+    assert error.value.status_code == 404
+
+
+async def test_revoke_is_undone_when_the_note_cannot_be_written(db, monkeypatch):
+    await db.users.insert_one({"discord_id": "7", "username": "staff", "strikes": 0})
+    await server.record_strike("7", "late", "head")
+
+    async def failing_note(*args, **kwargs):
+        raise RuntimeError("write failed")
+    monkeypatch.setattr(server, "add_staff_note", failing_note)
+
+    with pytest.raises(RuntimeError):
+        await server.revoke_strike("7", "super")
+
+    user = await db.users.find_one({"discord_id": "7"})
+    assert user["strikes"] == 1 and await active_strikes(db, "7") == 1
+    strike = await db.staff_notes.find_one({"type": "strike"})
+    assert "removed_at" not in strike
+
+
+async def test_legacy_strikes_without_ledger_entries_can_be_removed(db):
+    await db.users.insert_one({"discord_id": "9", "username": "old", "strikes": 1})
+
+    assert await server.revoke_strike("9", "super") == {"strikes": 0}
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def admin(db, login):
+    client = await login(discord_id="1", username="admin", is_admin=True)
+    # Written before strikes and probation existed
+    await db.users.insert_one({"discord_id": "2", "username": "old", "role": "player"})
+    return client
+
+
+async def test_users_get_the_model_defaults(admin):
+    response = admin.get("/api/users")
+
+    assert response.status_code == 200
+    old = next(user for user in response.json() if user["discord_id"] == "2")
+    assert old["strikes"] == 0 and old["on_probation"] is False and old["staff_rank"] is None
+    assert old.keys() == {*response.json()[0].keys()}
+
+
+async def test_ndjson_with_selected_fields(admin):
+    response = admin.get("/api/users", params={"format": "ndjson", "fields": "discord_id,strikes"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert users == [{"discord_id": "1", "strikes": 0}, {"discord_id": "2", "strikes": 0}]
+    assert admin.get("/api/users", params={"format": "csv"}).status_code == 422